@@ -1,12 +1,18 @@
-from flask import Flask, render_template, request, jsonify, send_file
-from flask_socketio import SocketIO, emit
+from flask import Flask, render_template, request, jsonify, send_file, Response, stream_with_context
+from flask_socketio import SocketIO, emit, join_room
+from flask.json.provider import JSONProvider
+from flask_compress import Compress
 import json
+import orjson
 import uuid
+import hashlib
+import random
 import threading
 import time
 import asyncio
 import aiohttp
 import os
+import sys
 from datetime import datetime
 from typing import Dict, List, Optional, Set, Any
 from dataclasses import dataclass, field
@@ -15,6 +21,7 @@ import io
 import re
 import logging
 from enum import Enum
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 import traceback
@@ -46,19 +53,268 @@ if not ANTHROPIC_API_KEY.startswith('sk-ant-'):
     logger.error("Please check your API key and try again")
     raise ValueError("ANTHROPIC_API_KEY appears to be invalid")
 
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson for jsonify() and request.get_json()"""
+    mimetype = "application/json"
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
 
-# Thread pool for async operations
-executor = ThreadPoolExecutor(max_workers=10)
+# Compress JSON responses - ZIP downloads are already deflated and are left alone
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_LEVEL'] = 4
+app.config['COMPRESS_BR_LEVEL'] = 4
+app.config['COMPRESS_MIN_SIZE'] = 1024
+Compress(app)
+
+# Socket.IO frames are msgpack-encoded; REST endpoints stay JSON
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading', serializer='msgpack')
+# Room every dashboard client joins; high-frequency updates go here and are skipped when it is empty
+DASHBOARD_ROOM = 'dashboard'
+
+# Worker threads for blocking calls offloaded from the event loop
+MAX_WORKER_THREADS = min(8, (os.cpu_count() or 1) * 2)
+# Agent tasks processed at once; each holds a worker thread while it runs
+MAX_CONCURRENT_TASKS = 8
+# Scheduler wakes on agent/task state changes, and at least this often for timeouts
+SCHEDULER_IDLE_INTERVAL = 5.0
+SCHEDULER_COALESCE_DELAY = 0.05
+# Minimum spacing of system_update deltas; changes in between ride along with the next one
+STATUS_EMIT_INTERVAL = 0.25
+
+# Anthropic API retry policy
+API_MAX_RETRIES = 5
+API_BASE_BACKOFF = 1.5
+API_MAX_BACKOFF = 60.0
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504, 529}
+
+# Token buckets (requests/second, burst size) shaping outgoing API calls
+API_AGENT_RATE, API_AGENT_BURST = 1.0, 3
+API_GLOBAL_RATE, API_GLOBAL_BURST = 50.0, 50
+# Input+output token budget per minute (set to your Anthropic tier) and in-flight request cap
+API_TOKENS_PER_MINUTE = int(os.getenv("ANTHROPIC_TOKENS_PER_MINUTE", "80000"))
+API_MAX_CONCURRENCY = 10
+
+# Agent messages kept in memory; older ones fall off the ring buffer
+MAX_MESSAGES = 100
+# Tail of each agent's accumulated responses kept in work_output (and sent with agent updates)
+WORK_OUTPUT_MAX_CHARS = 20000
+
+# Project ZIPs larger than this are rebuilt per download instead of cached
+ZIP_CACHE_MAX_BYTES = 10 * 1024 * 1024
+
+# System prompts per agent role. Kept free of per-agent text so every agent in a role
+# sends a byte-identical, prompt-cacheable system block; name and specialty go in the task context
+AGENT_ROLE_PROMPTS = {
+    "Manager": """You are a Senior Technical Lead and Project Manager.
+
+CORE RESPONSIBILITIES:
+- Design system architecture and break down complex projects into tasks
+- Review code quality and ensure best practices
+- Coordinate team members and manage project flow
+- Ensure all requirements are met and deliverables are complete
+
+WORKFLOW:
+1. For initial planning: Create task breakdown and assign to workers
+2. For review tasks: Review completed work and mark as complete
+
+TASK ASSIGNMENT FORMAT:
+When creating tasks, use this JSON format with the EXACT agent names:
+```json
+{
+    "tasks": [
+        {
+            "agent": "Developer1",
+            "description": "Detailed task description",
+            "priority": 1-10,
+            "dependencies": [],
+            "files_expected": ["file1.py", "file2.js"]
+        }
+    ]
+}
+```
+
+AVAILABLE AGENTS:
+- Developer1 (Full Stack Developer) - Frontend, Backend, DevOps, Database, API Development
+- Developer2 (Full Stack Developer) - Frontend, Backend, DevOps, Database, API Development
+- Developer3 (Full Stack Developer) - Frontend, Backend, DevOps, Database, API Development
+
+IMPORTANT: Use the exact agent names: "Developer1", "Developer2", or "Developer3"
+
+QUALITY STANDARDS:
+- Code must follow best practices and be production-ready
+- All functions must have proper error handling
+- Files must be properly structured and documented
+- Security considerations must be addressed
+
+REVIEW PROCESS:
+- For review tasks, examine the completed work and files created
+- Check if the task meets requirements and quality standards
+- Mark as complete if satisfied, or provide feedback if not
+
+IMPORTANT: After providing the task assignments in JSON format, end your response with "TASK COMPLETED" to indicate completion.""",
+
+    "Full Stack Developer": """You are a Senior Full Stack Developer.
+
+TECHNICAL EXPERTISE:
+- Frontend: React/TypeScript, HTML/CSS, JavaScript, modern web development
+- Backend: Python/Flask, Node.js, Java, API development, database design
+- Systems: C, C++, low-level programming, performance optimization
+- DevOps: Docker, CI/CD, cloud deployment, monitoring
+- Database: SQL, NoSQL, data modeling, optimization
+- Security: Authentication, authorization, data protection
+
+DEVELOPMENT STANDARDS:
+- Write clean, maintainable, production-ready code
+- Implement proper error handling and validation
+- Follow best practices for security and performance
+- Use modern development patterns and tools
+- Include comprehensive documentation and comments
+
+OUTPUT FORMAT:
+- Always provide complete, working code
+- Include proper imports and dependencies
+- Add comprehensive comments
+- Ensure code is production-ready
+- ALWAYS use this exact format for files: ```filename: path/to/file.ext
+
+EXAMPLE FILE FORMATS:
+
+Frontend (React/TypeScript):
+```filename: src/components/App.tsx
+import React from 'react';
+
+interface AppProps {
+  title: string;
+}
+
+export const App: React.FC<AppProps> = ({ title }) => {
+  return (
+    <div className="app">
+      <header className="App-header">
+        <h1>{title}</h1>
+      </header>
+    </div>
+  );
+};
+```
+
+Backend (Python/Flask):
+```filename: app.py
+from flask import Flask, jsonify, request
+from flask_cors import CORS
+
+app = Flask(__name__)
+CORS(app)
+
+@app.route('/api/health', methods=['GET'])
+def health_check():
+    return jsonify({'status': 'healthy'})
+
+if __name__ == '__main__':
+    app.run(debug=True)
+```
+
+DevOps (Docker):
+```filename: docker-compose.yml
+version: '3.8'
+services:
+  app:
+    build: .
+    ports:
+      - "5000:5000"
+    environment:
+      - FLASK_ENV=production
+```
+
+IMPORTANT: Always use the exact format ```filename: path/to/file.ext for each file you create.
+
+Always end your response with "TASK COMPLETED" when finished."""
+}
+
+# Patterns applied to every agent response, compiled once
+MANAGER_JSON_RES = [
+    re.compile(r'```json\s*\n(.*?)\n```', re.DOTALL),
+    re.compile(r'```\s*\n(.*?)\n```', re.DOTALL),  # Fallback for any code block
+    re.compile(r'\{.*?"tasks".*?\}', re.DOTALL),  # Simple JSON with tasks
+    re.compile(r'\{[^{}]*"tasks"[^{}]*\}', re.DOTALL),  # More flexible JSON pattern
+]
+# File blocks in agent responses, tried in order; the last one is the unnamed-block fallback
+FILE_BLOCK_RES = [
+    # Pattern 1: ```language filename: path/to/file.ext
+    re.compile(r'```(?:[\w+]+)?\s*filename:\s*([^\n]+)\n(.*?)```', re.DOTALL),
+    # Pattern 2: ```path/to/file.ext (language)
+    re.compile(r'```([^\n]+\.(?:py|js|jsx|ts|tsx|css|html|json|yml|yaml|md|txt|sh|dockerfile|sql|xml|env|gitignore|dockerignore|nvmrc|package\.json|requirements\.txt|README\.md))\n(.*?)```', re.DOTALL),
+    # Pattern 3: filename: path/to/file.ext\n```language\n
+    re.compile(r'filename:\s*([^\n]+\.(?:py|js|jsx|ts|tsx|css|html|json|yml|yaml|md|txt|sh|dockerfile|sql|xml|env|gitignore|dockerignore|nvmrc|package\.json|requirements\.txt|README\.md))\n```(?:[\w+]+)?\n(.*?)```', re.DOTALL),
+    # Pattern 4: File: path/to/file.ext\n```language\n
+    re.compile(r'File:\s*([^\n]+\.(?:py|js|jsx|ts|tsx|css|html|json|yml|yaml|md|txt|sh|dockerfile|sql|xml|env|gitignore|dockerignore|nvmrc|package\.json|requirements\.txt|README\.md))\n```(?:[\w+]+)?\n(.*?)```', re.DOTALL),
+    # Pattern 5: Create file: path/to/file.ext\n```language\n
+    re.compile(r'Create file:\s*([^\n]+\.(?:py|js|jsx|ts|tsx|css|html|json|yml|yaml|md|txt|sh|dockerfile|sql|xml|env|gitignore|dockerignore|nvmrc|package\.json|requirements\.txt|README\.md))\n```(?:[\w+]+)?\n(.*?)```', re.DOTALL),
+    # Pattern 6: Simple code blocks with common extensions
+    re.compile(r'```([^\n]+\.(?:py|js|jsx|ts|tsx|css|html|json|yml|yaml|md|txt|sh|dockerfile|sql|xml|env|gitignore|dockerignore|nvmrc|package\.json|requirements\.txt|README\.md))\n(.*?)```', re.DOTALL),
+    # Pattern 7: Any code block that might contain a file (fallback)
+    re.compile(r'```(?:[\w+]+)?\n(.*?)```', re.DOTALL),
+]
+# Phrases that mark an agent response as finished; one case-insensitive pass instead of lower() + N scans
+COMPLETION_RE = re.compile('|'.join(re.escape(phrase) for phrase in [
+    "task completed",
+    "task finished",
+    "implementation complete",
+    "work completed",
+    "finished successfully",
+    "planning complete",
+    "architecture complete",
+    "project plan complete",
+    "task breakdown complete",
+    "assignments complete",
+    "done",
+    "complete",
+    "finished",
+    "ready",
+    "implemented",
+    "created",
+    "built",
+    "developed",
+    "configured",
+    "set up",
+    "established"
+]), re.IGNORECASE | re.ASCII)
+BLANK_LINES_RE = re.compile(r'\n\s*\n')
+INLINE_SPACE_RE = re.compile(r'[ \t]+')
+WHITESPACE_RE = re.compile(r'\s+')
+JSON_FENCE_RE = re.compile(r'```\s*json\s*')
+FENCE_END_RE = re.compile(r'```\s*\n')
+FENCE_START_RE = re.compile(r'\n\s*```')
+TRAILING_COMMA_OBJ_RE = re.compile(r',\s*}')
+TRAILING_COMMA_ARR_RE = re.compile(r',\s*]')
+LOOSE_PAIR_RE = re.compile(r'(["\w])\s*:\s*(["\w])')
+UNQUOTED_KEY_RE = re.compile(r'(\w+):')
+UNQUOTED_VALUE_RE = re.compile(r':\s*([a-zA-Z][a-zA-Z0-9_]*)\s*([,}])')
+MISSING_COMMA_RE = re.compile(r'"\s*}\s*"')
+UNESCAPED_QUOTE_RE = re.compile(r'([^\\])"([^"]*?)([^\\])"')
+INVALID_FILENAME_CHARS_RE = re.compile(r'[<>:"/\\|?*]')
+CONTROL_CHARS_RE = re.compile(r'[\x01-\x08\x0B\x0C\x0E-\x1F\x7F]')
+TRAILING_SPACE_RE = re.compile(r'[ \t]+$', re.MULTILINE)
 
 # In-memory storage - no databases needed
 class MemoryStore:
     def __init__(self):
         self.agents = {}
         self.tasks = {}
-        self.messages = []
+        self.messages: deque = deque(maxlen=MAX_MESSAGES)
         self.projects = {}
         self.system_metrics = {
             'start_time': time.time(),
@@ -68,12 +324,69 @@ class MemoryStore:
             'api_calls': 0,
             'errors': 0
         }
+        self.agents_revision = 0  # bumped on any agent state change
+        self.agents_by_status: Dict[AgentStatus, Dict[str, None]] = {}  # status -> agent ids (ordered set)
+        self.inactive_agents: Set[str] = set()  # ids of agents with is_active False
+        self.agents_by_name: Dict[str, str] = {}  # lowercased agent name -> agent id
         self.lock = threading.Lock()
+        self.scheduler_wakeup = threading.Event()  # set when agent or task state changes
+    
+    def wake_scheduler(self):
+        """Signal the background scheduler that there may be work to do"""
+        self.scheduler_wakeup.set()
+    
+    def touch_agents(self):
+        """Record that agent state changed so cached agent views are rebuilt"""
+        self.agents_revision += 1
+    
+    def add_agent(self, agent):
+        """Register an agent and index it by name"""
+        self.agents[agent.id] = agent
+        self.agents_by_name[agent.name.lower().strip()] = agent.id
+    
+    def agent_named(self, name: str):
+        """Agent whose name matches case-insensitively, if any"""
+        agent_id = self.agents_by_name.get(name.lower().strip())
+        return self.agents.get(agent_id) if agent_id else None
+    
+    def index_agent_status(self, agent_id: str, old_status: Optional['AgentStatus'], new_status: 'AgentStatus'):
+        """Move an agent between status buckets, waking the scheduler only on a real change"""
+        if old_status == new_status:
+            return
+        if old_status is not None:
+            self.agents_by_status.get(old_status, {}).pop(agent_id, None)
+        self.agents_by_status.setdefault(new_status, {})[agent_id] = None
+        self.wake_scheduler()
+    
+    def index_agent_active(self, agent_id: str, is_active: bool):
+        """Track deactivated agents so the active count needs no scan"""
+        if is_active:
+            self.inactive_agents.discard(agent_id)
+        else:
+            self.inactive_agents.add(agent_id)
+    
+    def active_agent_count(self) -> int:
+        """Number of registered agents with is_active set"""
+        return len(self.agents) - len(self.inactive_agents)
+    
+    def agents_with_status(self, status: 'AgentStatus', agent_type: Optional[str] = None) -> List['Agent']:
+        """Registered agents in a status, optionally of one type, without scanning all agents"""
+        agents = (self.agents.get(aid) for aid in list(self.agents_by_status.get(status, ())))
+        return [a for a in agents if a is not None and (agent_type is None or a.agent_type == agent_type)]
+    
+    def recent_messages(self, count: int) -> List[dict]:
+        """Last `count` messages, oldest first"""
+        # list() copies the deque in one step; iterating it lazily races with appends from the event loop
+        return list(self.messages)[-count:]
     
     def clear(self):
         """Clear all stored data"""
         with self.lock:
             self.agents.clear()
+            self.agents_by_status.clear()
+            self.inactive_agents.clear()
+            self.agents_by_name.clear()
+            self.touch_agents()
             self.tasks.clear()
             self.messages.clear()
             self.projects.clear()
@@ -89,6 +402,9 @@ class MemoryStore:
 # Global memory store
 memory_store = MemoryStore()
 
+# Slotted dataclasses (Python 3.10+) drop the per-instance __dict__
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
 class TaskStatus(Enum):
     PENDING = "pending"
     IN_PROGRESS = "in_progress"
@@ -103,7 +419,7 @@ class AgentStatus(Enum):
     ERROR = "error"
     REVIEWING = "reviewing"
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Task:
     id: str
     description: str
@@ -120,7 +436,7 @@ class Task:
     max_retries: int = 3
     error_message: str = ""
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Agent:
     id: str
     name: str
@@ -129,7 +445,7 @@ class Agent:
     specialty: str
     status: AgentStatus = AgentStatus.IDLE
     manager_id: Optional[str] = None
-    subordinates: List[str] = field(default_factory=list)
+    subordinates: Dict[str, None] = field(default_factory=dict)  # ordered set of agent ids
     current_task_id: Optional[str] = None
     work_output: str = ""
     is_active: bool = True
@@ -142,9 +458,34 @@ class Agent:
         'success_rate': 1.0,
         'quality_score': 85
     })
+    _version: int = field(default=0, init=False, repr=False, compare=False)  # bumped on every mutation
+    _dict_cache: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)  # (version, dict)
+
+    def __setattr__(self, name, value):
+        if name == 'status':
+            memory_store.index_agent_status(self.id, getattr(self, 'status', None), value)
+        elif name == 'is_active':
+            memory_store.index_agent_active(self.id, value)
+        # object.__setattr__ rather than super(): slots=True rebuilds the class,
+        # which breaks the zero-argument super() cell
+        object.__setattr__(self, name, value)
+        if name not in ('_dict_cache', '_version'):
+            self.mark_dirty()
+
+    def mark_dirty(self):
+        """Invalidate the cached dict; call after mutating subordinates, skills or metrics in place"""
+        object.__setattr__(self, '_version', getattr(self, '_version', 0) + 1)
+        memory_store.touch_agents()
 
     def to_dict(self):
-        return {
+        """Serialized agent, rebuilt only after a mutation; treat the result as read-only"""
+        version = self._version
+        cached = self._dict_cache
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        # Tagged with the version read before building, so a dict that raced
+        # a concurrent mutation is never served once that mutation lands
+        data = {
             'id': self.id,
             'name': self.name,
             'role': self.role,
@@ -152,17 +493,19 @@ class Agent:
             'specialty': self.specialty,
             'status': self.status.value,
             'manager_id': self.manager_id,
-            'subordinates': self.subordinates,
+            'subordinates': list(self.subordinates),
             'current_task_id': self.current_task_id,
             'work_output': self.work_output,
             'is_active': self.is_active,
             'created_at': self.created_at.isoformat(),
             'last_activity': self.last_activity.isoformat(),
-            'skills': self.skills,
-            'performance_metrics': self.performance_metrics
+            'skills': list(self.skills),
+            'performance_metrics': dict(self.performance_metrics)
         }
+        object.__setattr__(self, '_dict_cache', (version, data))
+        return data
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Project:
     id: str
     name: str
@@ -171,6 +514,18 @@ class Project:
     created_at: datetime = field(default_factory=datetime.now)
     files: Dict[str, str] = field(default_factory=dict)  # filename -> content
     temp_dir: Optional[str] = None
+    files_version: int = 0  # bumped on every write to files
+    file_stats: Dict[str, tuple] = field(default_factory=dict)  # filename -> (size in bytes, lines)
+
+    def set_file(self, filename: str, content: str):
+        """Store file content, refresh its cached stats and bump the files version"""
+        self.files[filename] = content
+        self.file_stats[filename] = (len(content.encode('utf-8')), content.count('\n') + 1)
+        self.files_version += 1
+
+    @property
+    def files_etag(self) -> str:
+        return f"{self.id}-{self.files_version}"
 
 class AnthropicClient:
     def __init__(self, api_key: str):
@@ -184,14 +539,46 @@ class AnthropicClient:
         self.session = None
         self.request_count = 0
         self.error_count = 0
+        self._buckets: Dict[str, tuple] = {}  # key -> (tokens, last refill)
+        self._semaphore = None  # created lazily on the event loop
+        self._cooldown_until = 0.0  # monotonic deadline set by 429/529 responses
 
     async def _get_session(self):
         if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession()
+            self.session = aiohttp.ClientSession(
+                # Keep idle connections well past aiohttp's 15s default; agent calls are often further apart
+                connector=aiohttp.TCPConnector(limit=100, limit_per_host=20, keepalive_timeout=75,
+                                               enable_cleanup_closed=True, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=120, connect=10),
+                headers=self.headers
+            )
         return self.session
 
+    def _take_token(self, key: str, rate: float, capacity: float, cost: float = 1.0) -> float:
+        """Reserve `cost` tokens from a bucket and return how long to wait for them"""
+        now = time.monotonic()
+        tokens, last_refill = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - last_refill) * rate) - min(cost, capacity)
+        self._buckets[key] = (tokens, now)
+        return -tokens / rate if tokens < 0 else 0.0
+
+    async def _acquire(self, agent_id: Optional[str], estimated_tokens: int):
+        """Wait for the per-agent, global request and global token rate limits"""
+        wait = max(self._take_token('__global__', API_GLOBAL_RATE, API_GLOBAL_BURST),
+                   self._take_token('__tokens__', API_TOKENS_PER_MINUTE / 60, API_TOKENS_PER_MINUTE, estimated_tokens))
+        if agent_id:
+            wait = max(wait, self._take_token(agent_id, API_AGENT_RATE, API_AGENT_BURST))
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def _concurrency_limit(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(API_MAX_CONCURRENCY)
+        return self._semaphore
+
     async def generate_response(self, system_prompt: str, user_message: str, 
-                              max_tokens: int = 2000, temperature: float = 0.7) -> str:
+                              max_tokens: int = 2000, temperature: float = 0.7,
+                              agent_id: Optional[str] = None) -> str:
         """Generate AI response - only external API call"""
         try:
             session = await self._get_session()
@@ -203,24 +590,52 @@ class AnthropicClient:
                 "system": system_prompt,
                 "messages": [{"role": "user", "content": user_message}]
             }
+            body = orjson.dumps(payload)  # encoded once; retries resend the same bytes
             
             self.request_count += 1
             memory_store.system_metrics['api_calls'] += 1
             logger.info(f"Making API request #{self.request_count}")
             logger.info(f"📝 Request payload: {len(system_prompt)} chars system prompt, {len(user_message)} chars user message")
             
-            async with session.post(self.base_url, headers=self.headers, json=payload) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    response_text = result['content'][0]['text']
-                    logger.info(f"✅ API response received: {len(response_text)} chars")
-                    return response_text
-                else:
-                    error_text = await response.text()
-                    logger.error(f"API Error: {response.status} - {error_text}")
-                    self.error_count += 1
-                    memory_store.system_metrics['errors'] += 1
-                    return f"[API Error] Status: {response.status} - {error_text}"
+            # Rough token estimate (~4 chars per token) for the per-minute token budget
+            estimated_tokens = (len(system_prompt) + len(user_message)) // 4 + max_tokens
+            
+            for attempt in range(API_MAX_RETRIES):
+                await self._acquire(agent_id, estimated_tokens)
+                cooldown = self._cooldown_until - time.monotonic()
+                if cooldown > 0:
+                    logger.info(f"⏳ API cooling down, waiting {cooldown:.1f}s before request")
+                    await asyncio.sleep(cooldown)
+                try:
+                    async with self._concurrency_limit():
+                        async with session.post(self.base_url, data=body) as response:
+                            if response.status == 200:
+                                result = orjson.loads(await response.read())
+                                response_text = result['content'][0]['text']
+                                logger.info(f"✅ API response received: {len(response_text)} chars")
+                                return response_text
+                            
+                            # Read the body once; it decides retryability and goes into the error
+                            error_text = await response.text()
+                            overloaded = response.status == 529 or (response.status == 400 and 'overloaded' in error_text)
+                            if (overloaded or response.status in RETRYABLE_STATUSES) and attempt < API_MAX_RETRIES - 1:
+                                delay = self._retry_after(response.headers.get('Retry-After')) or self._backoff_delay(attempt)
+                                if overloaded or response.status == 429:
+                                    self._cooldown_until = max(self._cooldown_until, time.monotonic() + delay)
+                                logger.warning(f"⏳ API returned {response.status}, retrying in {delay:.1f}s (attempt {attempt + 1}/{API_MAX_RETRIES})")
+                            else:
+                                logger.error(f"API Error: {response.status} - {error_text}")
+                                self.error_count += 1
+                                memory_store.system_metrics['errors'] += 1
+                                return f"[API Error] Status: {response.status} - {error_text}"
+                    # Back off outside the concurrency limit so waiting retries don't hold a slot
+                    await asyncio.sleep(delay)
+                except (asyncio.TimeoutError, aiohttp.ClientConnectorError, aiohttp.ServerDisconnectedError) as e:
+                    if attempt == API_MAX_RETRIES - 1:
+                        raise
+                    delay = self._backoff_delay(attempt)
+                    logger.warning(f"⏳ API connection problem ({type(e).__name__}), retrying in {delay:.1f}s (attempt {attempt + 1}/{API_MAX_RETRIES})")
+                    await asyncio.sleep(delay)
                     
         except Exception as e:
             logger.error(f"Error calling Anthropic API: {e}")
@@ -231,6 +646,19 @@ class AnthropicClient:
             memory_store.system_metrics['errors'] += 1
             return f"[Error] {str(e)}"
 
+    @staticmethod
+    def _backoff_delay(attempt: int) -> float:
+        """Exponential backoff with jitter, capped at API_MAX_BACKOFF"""
+        return min(API_BASE_BACKOFF * 2 ** attempt + random.uniform(0, 1), API_MAX_BACKOFF)
+
+    @staticmethod
+    def _retry_after(value: Optional[str]) -> float:
+        """Seconds from a Retry-After header, 0 when absent or not numeric"""
+        try:
+            return min(max(float(value), 0.0), API_MAX_BACKOFF) if value else 0.0
+        except ValueError:
+            return 0.0
+
     async def close(self):
         if self.session and not self.session.closed:
             await self.session.close()
@@ -242,6 +670,8 @@ class TaskQueue:
         self.completed_tasks: Set[str] = set()
         self.failed_tasks: Set[str] = set()
         self.dependency_graph: Dict[str, Set[str]] = {}
+        self.dependents: Dict[str, Set[str]] = {}  # task id -> tasks waiting on it (reverse of dependency_graph)
+        self.unmet_dependencies: Dict[str, int] = {}  # task id -> dependencies not yet completed
         self._lock = threading.Lock()
 
     def add_task(self, task: Task):
@@ -249,6 +679,11 @@ class TaskQueue:
             memory_store.tasks[task.id] = task
             self.pending_tasks.append(task.id)
             self.dependency_graph[task.id] = set(task.dependencies)
+            unmet = self.dependency_graph[task.id] - self.completed_tasks
+            self.unmet_dependencies[task.id] = len(unmet)
+            for dep_id in unmet:
+                self.dependents.setdefault(dep_id, set()).add(task.id)
+            memory_store.wake_scheduler()
             logger.info(f"📝 Task added: {task.id} - {task.description[:50]}... (Agent: {task.agent_id})")
             logger.info(f"📊 Queue status: {len(self.pending_tasks)} pending, {len(self.in_progress_tasks)} in progress")
             
@@ -317,12 +752,15 @@ class TaskQueue:
             if task_id in self.in_progress_tasks:
                 self.in_progress_tasks.remove(task_id)
                 self.completed_tasks.add(task_id)
+                for dependent_id in self.dependents.pop(task_id, ()):
+                    self.unmet_dependencies[dependent_id] -= 1
                 task = memory_store.tasks[task_id]
                 task.status = TaskStatus.COMPLETED
                 task.completed_at = datetime.now()
                 task.output = output
                 task.files_created = files_created or []
                 memory_store.system_metrics['tasks_processed'] += 1
+                memory_store.wake_scheduler()
                 logger.info(f"Task completed: {task_id}")
 
     def fail_task(self, task_id: str, error: str = ""):
@@ -332,6 +770,7 @@ class TaskQueue:
                 task = memory_store.tasks[task_id]
                 task.retry_count += 1
                 task.error_message = error
+                memory_store.wake_scheduler()
                 
                 if task.retry_count <= task.max_retries:
                     task.status = TaskStatus.PENDING
@@ -343,8 +782,8 @@ class TaskQueue:
                     logger.error(f"Task failed permanently: {task_id} - {error}")
 
     def _are_dependencies_satisfied(self, task_id: str) -> bool:
-        dependencies = self.dependency_graph.get(task_id, set())
-        return all(dep_id in self.completed_tasks for dep_id in dependencies)
+        # Ids never registered through add_task have no counter and are not ready
+        return self.unmet_dependencies.get(task_id) == 0
 
     def get_status(self) -> Dict[str, int]:
         with self._lock:
@@ -355,6 +794,29 @@ class TaskQueue:
                 'failed': len(self.failed_tasks)
             }
 
+class _ZipChunkSink:
+    """Write-only, unseekable file object that hands ZipFile output back in chunks"""
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def _orjson_default(obj):
+    """Fallback encoder for objects orjson doesn't serialize natively"""
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
 class EnhancedMultiAgentSystem:
     def __init__(self):
         self.task_queue = TaskQueue()
@@ -362,9 +824,85 @@ class EnhancedMultiAgentSystem:
         self.system_running = False
         self.current_project = None
         self.processing_lock = threading.Lock()
+        self._agents_json_cache = None  # (cache key, serialized body)
+        self._zip_cache = None  # (files_etag, zip bytes)
+        self._file_listing_cache = None  # (files_etag, rendered file listing)
+        self._task_semaphore = None  # created lazily on the event loop
+        self._scheduler_started = False
+        self._inflight_tasks: Set[str] = set()  # task ids currently being processed
+        self._background_tasks: Set[asyncio.Task] = set()  # fire-and-forget tasks, held so they aren't collected
+        self.dashboard_clients: Set[str] = set()  # sids of connected Socket.IO clients
+        self._emitted_agents: Dict[str, dict] = {}  # agent id -> cached dict last emitted
+        self._last_emitted_message_id = None
+        self._emitted_summary = None  # queue, run state and metric counters in the last delta
+        self._last_status_emit = 0.0  # monotonic time of the last system_update delta
+        self._status_emit_pending = False  # a delta was held back by STATUS_EMIT_INTERVAL
+        # Single writer thread: disk copies are written off the agent's path, in submission order
+        self._file_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="file-writer")
+        self._resolved_roots: Dict[str, Path] = {}  # project directory -> resolved Path
+        self._created_dirs: Set[Path] = set()  # directories the file writer has already created
+        self._loop = self._start_event_loop()
         self.setup_default_agents()
         # Don't start background processing until project starts
 
+    def _start_event_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the persistent event loop that owns all async work"""
+        loop = asyncio.new_event_loop()
+        # Blocking calls are offloaded via loop.run_in_executor onto this single pool
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=MAX_WORKER_THREADS + MAX_CONCURRENT_TASKS))
+        thread = threading.Thread(target=loop.run_forever, name="event-loop", daemon=True)
+        thread.start()
+        return loop
+
+    def run_coroutine(self, coro, timeout: Optional[float] = None):
+        """Run a coroutine on the persistent event loop and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout=timeout)
+
+    async def _run_task(self, agent: Agent, task: Task):
+        """Process one task on the worker pool, skipping tasks already in flight"""
+        if task.id in self._inflight_tasks:
+            logger.debug(f"⏭️ Task {task.id} already being processed, skipping")
+            return
+        if self._task_semaphore is None:
+            self._task_semaphore = asyncio.Semaphore(MAX_CONCURRENT_TASKS)
+        self._inflight_tasks.add(task.id)
+        try:
+            async with self._task_semaphore:
+                await asyncio.get_running_loop().run_in_executor(None, self._process_task_sync, agent, task)
+        finally:
+            self._inflight_tasks.discard(task.id)
+
+    def _spawn_task(self, agent: Agent, task: Task):
+        """Start processing a task without waiting for it, keeping a reference until it finishes"""
+        future = asyncio.ensure_future(self._run_task(agent, task))
+        self._background_tasks.add(future)
+        
+        def on_done(done: asyncio.Task):
+            self._background_tasks.discard(done)
+            if not done.cancelled() and done.exception() is not None:
+                logger.error(f"❌ Task {task.id} for {agent.name} failed: {done.exception()}")
+        
+        future.add_done_callback(on_done)
+
+    def _dispatch_tasks(self, assignments: List[tuple]):
+        """Process (agent, task) pairs concurrently on the event loop and wait for all of them"""
+        if not assignments:
+            return
+        async def run_all():
+            return await asyncio.gather(*(self._run_task(agent, task) for agent, task in assignments),
+                                        return_exceptions=True)
+        for (agent, task), result in zip(assignments, self.run_coroutine(run_all())):
+            if isinstance(result, Exception):
+                logger.error(f"❌ Task {task.id} for {agent.name} failed: {result}")
+
+    def shutdown(self):
+        """Close the API client, flush pending file writes and stop the event loop"""
+        try:
+            self.run_coroutine(self.anthropic_client.close(), timeout=5)
+        finally:
+            self._file_writer.shutdown(wait=True)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+
     def setup_default_agents(self):
         """Setup default agents - stored in memory only"""
         # Manager Agent
@@ -411,149 +949,17 @@ class EnhancedMultiAgentSystem:
         )
         
         # Set up relationships
-        manager.subordinates = [dev1.id, dev2.id, dev3.id]
+        manager.subordinates = dict.fromkeys([dev1.id, dev2.id, dev3.id])
         
         # Store in memory
-        memory_store.agents[manager.id] = manager
-        memory_store.agents[dev1.id] = dev1
-        memory_store.agents[dev2.id] = dev2
-        memory_store.agents[dev3.id] = dev3
+        for agent in (manager, dev1, dev2, dev3):
+            memory_store.add_agent(agent)
         
         logger.info(f"Default agents created: {len(memory_store.agents)} agents")
 
     def get_agent_prompts(self, agent: Agent) -> str:
         """Get specialized prompts for each agent type"""
-        prompts = {
-            "Manager": f"""You are {agent.name}, a Senior Technical Lead and Project Manager.
-
-CORE RESPONSIBILITIES:
-- Design system architecture and break down complex projects into tasks
-- Review code quality and ensure best practices
-- Coordinate team members and manage project flow
-- Ensure all requirements are met and deliverables are complete
-
-WORKFLOW:
-1. For initial planning: Create task breakdown and assign to workers
-2. For review tasks: Review completed work and mark as complete
-
-TASK ASSIGNMENT FORMAT:
-When creating tasks, use this JSON format with the EXACT agent names:
-```json
-{{
-    "tasks": [
-        {{
-            "agent": "Developer1",
-            "description": "Detailed task description",
-            "priority": 1-10,
-            "dependencies": [],
-            "files_expected": ["file1.py", "file2.js"]
-        }}
-    ]
-}}
-```
-
-AVAILABLE AGENTS:
-- Developer1 (Full Stack Developer) - Frontend, Backend, DevOps, Database, API Development
-- Developer2 (Full Stack Developer) - Frontend, Backend, DevOps, Database, API Development
-- Developer3 (Full Stack Developer) - Frontend, Backend, DevOps, Database, API Development
-
-IMPORTANT: Use the exact agent names: "Developer1", "Developer2", or "Developer3"
-
-QUALITY STANDARDS:
-- Code must follow best practices and be production-ready
-- All functions must have proper error handling
-- Files must be properly structured and documented
-- Security considerations must be addressed
-
-REVIEW PROCESS:
-- For review tasks, examine the completed work and files created
-- Check if the task meets requirements and quality standards
-- Mark as complete if satisfied, or provide feedback if not
-
-IMPORTANT: After providing the task assignments in JSON format, end your response with "TASK COMPLETED" to indicate completion.
-
-Your specialty: {agent.specialty}""",
-
-            "Full Stack Developer": f"""You are {agent.name}, a Senior Full Stack Developer.
-
-TECHNICAL EXPERTISE:
-- Frontend: React/TypeScript, HTML/CSS, JavaScript, modern web development
-- Backend: Python/Flask, Node.js, Java, API development, database design
-- Systems: C, C++, low-level programming, performance optimization
-- DevOps: Docker, CI/CD, cloud deployment, monitoring
-- Database: SQL, NoSQL, data modeling, optimization
-- Security: Authentication, authorization, data protection
-
-DEVELOPMENT STANDARDS:
-- Write clean, maintainable, production-ready code
-- Implement proper error handling and validation
-- Follow best practices for security and performance
-- Use modern development patterns and tools
-- Include comprehensive documentation and comments
-
-OUTPUT FORMAT:
-- Always provide complete, working code
-- Include proper imports and dependencies
-- Add comprehensive comments
-- Ensure code is production-ready
-- ALWAYS use this exact format for files: ```filename: path/to/file.ext
-
-EXAMPLE FILE FORMATS:
-
-Frontend (React/TypeScript):
-```filename: src/components/App.tsx
-import React from 'react';
-
-interface AppProps {{
-  title: string;
-}}
-
-export const App: React.FC<AppProps> = ({{ title }}) => {{
-  return (
-    <div className="app">
-      <header className="App-header">
-        <h1>{{title}}</h1>
-      </header>
-    </div>
-  );
-}};
-```
-
-Backend (Python/Flask):
-```filename: app.py
-from flask import Flask, jsonify, request
-from flask_cors import CORS
-
-app = Flask(__name__)
-CORS(app)
-
-@app.route('/api/health', methods=['GET'])
-def health_check():
-    return jsonify({{'status': 'healthy'}})
-
-if __name__ == '__main__':
-    app.run(debug=True)
-```
-
-DevOps (Docker):
-```filename: docker-compose.yml
-version: '3.8'
-services:
-  app:
-    build: .
-    ports:
-      - "5000:5000"
-    environment:
-      - FLASK_ENV=production
-```
-
-IMPORTANT: Always use the exact format ```filename: path/to/file.ext for each file you create.
-
-Your specialty: {agent.specialty}
-Always end your response with "TASK COMPLETED" when finished."""
-        }
-        
-        return prompts.get(agent.role, prompts["Manager"])
+        return AGENT_ROLE_PROMPTS.get(agent.role, AGENT_ROLE_PROMPTS["Manager"])
 
     async def start_project(self, project_description: str):
         """Start a new project - all data stored in memory"""
@@ -570,13 +976,14 @@ Always end your response with "TASK COMPLETED" when finished."""
             )
             
             # Create temporary directory for files
-            project.temp_dir = tempfile.mkdtemp(prefix="multiagent_")
+            project.temp_dir = await asyncio.get_running_loop().run_in_executor(
+                None, lambda: tempfile.mkdtemp(prefix="multiagent_"))
             
             memory_store.projects[project.id] = project
             
             # Reset system state
             self.task_queue = TaskQueue()
-            memory_store.messages = []
+            memory_store.messages.clear()
             
             # Reset agent states
             for agent in memory_store.agents.values():
@@ -642,9 +1049,9 @@ IMPORTANT: After providing the task assignments in JSON format, end your respons
             # Start background processing
             self.start_background_processing()
             
-            # Immediately process the planning task
+            # Immediately process the planning task on the worker pool so the loop stays free
             logger.info(f"🎯 Immediately processing planning task for {manager.name}")
-            self._process_task_sync(manager, planning_task)
+            self._spawn_task(manager, planning_task)
             
             # Emit project started event
             socketio.emit('project_started', {
@@ -661,12 +1068,20 @@ IMPORTANT: After providing the task assignments in JSON format, end your respons
             return False
 
     def start_background_processing(self):
-        """Start background task processing"""
+        """Start background task processing (once; later projects reuse the same scheduler)"""
+        if self._scheduler_started:
+            memory_store.wake_scheduler()
+            return
+        self._scheduler_started = True
+        
         def process_tasks():
             logger.info("🔄 Background task processing loop started")
             while True:
                 try:
                     if self.system_running:
+                        # Changes made from here on schedule another pass
+                        memory_store.scheduler_wakeup.clear()
+                        
                         # First, aggressively assign any unassigned tasks to idle workers
                         self._assign_tasks_to_idle_workers()
                         
@@ -682,24 +1097,17 @@ IMPORTANT: After providing the task assignments in JSON format, end your respons
                         if ready_tasks:
                             logger.info(f"📋 Processing {len(ready_tasks)} ready tasks")
                             
-                            # Process tasks in parallel using threads
-                            threads = []
+                            # Process tasks concurrently on the event loop's worker pool
+                            assignments = []
                             for task in ready_tasks:
                                 agent = memory_store.agents.get(task.agent_id)
                                 if agent and agent.is_active:
-                                    # Create a thread for each task
-                                    thread = threading.Thread(
-                                        target=self._process_task_sync,
-                                        args=(agent, task)
-                                    )
-                                    threads.append(thread)
-                                    thread.start()
+                                    assignments.append((agent, task))
                                 else:
                                     logger.warning(f"⚠️ Agent {task.agent_id} not found or inactive")
                             
-                            # Wait for all threads to complete
-                            for thread in threads:
-                                thread.join()
+                            # Wait for all tasks to complete
+                            self._dispatch_tasks(assignments)
                         
                         # Also process any in-progress tasks that might be stuck
                         self._process_stuck_tasks()
@@ -718,18 +1126,23 @@ IMPORTANT: After providing the task assignments in JSON format, end your respons
                         
                         # Debug: Log current state
                         task_status = self.task_queue.get_status()
-                        idle_workers = [a for a in memory_store.agents.values() if a.agent_type == "worker" and a.status == AgentStatus.IDLE]
-                        idle_manager = [a for a in memory_store.agents.values() if a.agent_type == "manager" and a.status == AgentStatus.IDLE]
-                        working_agents = [a for a in memory_store.agents.values() if a.status == AgentStatus.WORKING]
+                        working_agents = memory_store.agents_with_status(AgentStatus.WORKING)
                         
-                        logger.debug(f"📊 Debug - Tasks: {task_status}, Idle workers: {len(idle_workers)}, Idle manager: {len(idle_manager)}, Working agents: {len(working_agents)}")
+                        if logger.isEnabledFor(logging.DEBUG):
+                            idle_workers = memory_store.agents_with_status(AgentStatus.IDLE, "worker")
+                            idle_manager = memory_store.agents_with_status(AgentStatus.IDLE, "manager")
+                            logger.debug(f"📊 Debug - Tasks: {task_status}, Idle workers: {len(idle_workers)}, Idle manager: {len(idle_manager)}, Working agents: {len(working_agents)}")
                         
                         # If we have working agents but no tasks being processed, force process them
                         if working_agents and task_status['in_progress'] > 0:
                             logger.info(f"🔄 Found {len(working_agents)} working agents with {task_status['in_progress']} in-progress tasks, forcing processing")
                             self._force_process_in_progress_tasks()
                         
-                        time.sleep(1)  # Check every 1 second for more responsiveness
+                        # Sleep until agent/task state changes, batching bursts of changes into one pass;
+                        # come back sooner if a status delta is waiting on STATUS_EMIT_INTERVAL
+                        idle_timeout = STATUS_EMIT_INTERVAL if self._status_emit_pending else SCHEDULER_IDLE_INTERVAL
+                        if memory_store.scheduler_wakeup.wait(idle_timeout):
+                            time.sleep(SCHEDULER_COALESCE_DELAY)
                     else:
                         time.sleep(5)  # Wait longer when system not running
                     
@@ -739,8 +1152,8 @@ IMPORTANT: After providing the task assignments in JSON format, end your respons
                     logger.error(f"🔍 Traceback: {traceback.format_exc()}")
                     time.sleep(5)  # Wait longer on error
 
-        thread = threading.Thread(target=process_tasks, daemon=True)
-        thread.start()
+        # Let Flask-SocketIO pick the thread/greenlet type matching its async mode
+        socketio.start_background_task(process_tasks)
         logger.info("✅ Background task processing started")
 
     def _process_task_sync(self, agent: Agent, task: Task):
@@ -776,127 +1189,113 @@ IMPORTANT: After providing the task assignments in JSON format, end your respons
             
             # Build context for the task
             context = self._build_task_context(agent, task)
-            logger.info(f"📝 Built context for {agent.name}")
+            logger.info(f"📝 Built context for {agent.name} "
+                        f"(version {hashlib.blake2b(context.encode(), digest_size=4).hexdigest()})")
             
             # Get agent's specialized prompt
             system_prompt = self.get_agent_prompts(agent)
             logger.info(f"🤖 Using system prompt for {agent.name}")
             
-            # Create a new event loop for this task
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            try:
-                logger.info(f"🔄 Generating AI response for {agent.name}...")
-                # Generate response
-                response = loop.run_until_complete(
-                    self.anthropic_client.generate_response(
-                        system_prompt, context, max_tokens=3000, temperature=0.7
-                    )
+            logger.info(f"🔄 Generating AI response for {agent.name}...")
+            # Generate response
+            response = self.run_coroutine(
+                self.anthropic_client.generate_response(
+                    system_prompt, context, max_tokens=3000, temperature=0.7,
+                    agent_id=agent.id
                 )
-                logger.info(f"✅ AI response generated for {agent.name} ({len(response)} chars)")
-                
-                # Check if response contains error indicators
-                if response.startswith("[API Error]") or response.startswith("[Error]"):
-                    logger.error(f"❌ API call failed for {agent.name}: {response}")
-                    # Don't mark task as complete, let it retry
-                    return
-                
-                # Update agent output
-                agent.work_output += f"\n[{datetime.now().strftime('%H:%M:%S')}] {response}"
-                
-                # Extract files from response
-                files_created = self._extract_files_from_response(response)
-                if files_created:
-                    logger.info(f"📁 Created {len(files_created)} files: {files_created}")
-                else:
-                    logger.warning(f"⚠️ No files were extracted from {agent.name}'s response")
-                    logger.debug(f"📝 Response preview: {response[:200]}...")
-                
-                # Check if task is completed - be more strict
-                task_completed = False
-                
-                # Check for explicit completion indicators
-                if "TASK COMPLETED" in response:
+            )
+            logger.info(f"✅ AI response generated for {agent.name} ({len(response)} chars)")
+            
+            # Check if response contains error indicators
+            if response.startswith("[API Error]") or response.startswith("[Error]"):
+                logger.error(f"❌ API call failed for {agent.name}: {response}")
+                # Don't mark task as complete, let it retry
+                return
+            
+            # Update agent output
+            agent.work_output = (agent.work_output + f"\n[{datetime.now().strftime('%H:%M:%S')}] {response}")[-WORK_OUTPUT_MAX_CHARS:]
+            
+            # Extract files from response
+            files_created = self._extract_files_from_response(response)
+            if files_created:
+                logger.info(f"📁 Created {len(files_created)} files: {files_created}")
+            else:
+                logger.warning(f"⚠️ No files were extracted from {agent.name}'s response")
+                logger.debug(f"📝 Response preview: {response[:200]}...")
+            
+            # Check if task is completed - be more strict
+            task_completed = False
+            
+            # Check for explicit completion indicators
+            if "TASK COMPLETED" in response:
+                task_completed = True
+                logger.info(f"✅ Task completed with explicit indicator")
+            
+            # For manager tasks, check if JSON was generated with proper structure
+            elif agent.agent_type == "manager" and not task_completed:
+                for pattern in MANAGER_JSON_RES[:3]:
+                    # Additional validation: check if JSON actually contains task assignments
+                    json_match = pattern.search(response)
+                    if json_match:
+                        try:
+                            json_str = json_match.group(1) if len(json_match.groups()) > 0 else json_match.group(0)
+                            task_data = json.loads(json_str)
+                            if "tasks" in task_data and isinstance(task_data["tasks"], list) and len(task_data["tasks"]) > 0:
+                                task_completed = True
+                                logger.info(f"👨‍💼 Manager task considered complete due to valid JSON task assignments")
+                                break
+                        except json.JSONDecodeError:
+                            logger.debug(f"❌ JSON found but invalid, not marking complete")
+                            continue
+            
+            # For final review, check for project completion
+            elif agent.agent_type == "manager" and "FINAL PROJECT REVIEW" in task.description and not task_completed:
+                if "PROJECT COMPLETED" in response:
                     task_completed = True
-                    logger.info(f"✅ Task completed with explicit indicator")
+                    logger.info(f"👨‍💼 Final review completed, project ready for delivery")
+                    # Mark project as ready for completion
+                    self._mark_project_ready_for_completion()
+            
+            # For worker tasks, only consider complete if they generated files AND have substantial response
+            elif agent.agent_type == "worker" and not task_completed and files_created and len(response.strip()) > 100:
+                task_completed = True
+                logger.info(f"👷 Worker task considered complete due to file creation and substantial response")
+            
+            # For any task, check if it's substantially complete
+            elif not task_completed and len(response.strip()) > 500 and self._is_task_complete(response):
+                task_completed = True
+                logger.info(f"✅ Task considered complete due to substantial response and completion indicators")
+            
+            if task_completed:
+                # If no files were created but this is a worker agent, try to create basic files
+                if not files_created and agent.agent_type == "worker":
+                    logger.info(f"🔄 No files created by {agent.name}, creating basic files...")
+                    files_created = self._create_basic_files_for_agent(agent, task)
                 
-                # For manager tasks, check if JSON was generated with proper structure
-                elif agent.agent_type == "manager" and not task_completed:
-                    json_patterns = [r'```json\s*\n(.*?)\n```', r'```\s*\n(.*?)\n```', r'\{.*?"tasks".*?\}']
-                    for pattern in json_patterns:
-                        if re.search(pattern, response, re.DOTALL):
-                            # Additional validation: check if JSON actually contains task assignments
-                            json_match = re.search(pattern, response, re.DOTALL)
-                            if json_match:
-                                try:
-                                    json_str = json_match.group(1) if len(json_match.groups()) > 0 else json_match.group(0)
-                                    task_data = json.loads(json_str)
-                                    if "tasks" in task_data and isinstance(task_data["tasks"], list) and len(task_data["tasks"]) > 0:
-                                        task_completed = True
-                                        logger.info(f"👨‍💼 Manager task considered complete due to valid JSON task assignments")
-                                        break
-                                except json.JSONDecodeError:
-                                    logger.debug(f"❌ JSON found but invalid, not marking complete")
-                                    continue
+                self.task_queue.complete_task(task.id, response, files_created)
+                agent.status = AgentStatus.IDLE  # Reset to idle so it can pick up new tasks
+                agent.current_task_id = None
+                agent.performance_metrics['tasks_completed'] += 1
+                agent.mark_dirty()
                 
-                # For final review, check for project completion
-                elif agent.agent_type == "manager" and "FINAL PROJECT REVIEW" in task.description and not task_completed:
-                    if "PROJECT COMPLETED" in response:
-                        task_completed = True
-                        logger.info(f"👨‍💼 Final review completed, project ready for delivery")
-                        # Mark project as ready for completion
-                        self._mark_project_ready_for_completion()
+                # Handle manager task creation and notify completion in one event-loop round trip
+                self.run_coroutine(self._finish_task(agent, task, response))
                 
-                # For worker tasks, only consider complete if they generated files AND have substantial response
-                elif agent.agent_type == "worker" and not task_completed and files_created and len(response.strip()) > 100:
-                    task_completed = True
-                    logger.info(f"👷 Worker task considered complete due to file creation and substantial response")
+                logger.info(f"🎉 Task completed for {agent.name}")
                 
-                # For any task, check if it's substantially complete
-                elif not task_completed and len(response.strip()) > 500 and self._is_task_complete(response):
-                    task_completed = True
-                    logger.info(f"✅ Task considered complete due to substantial response and completion indicators")
+                # Immediately try to assign new task to this worker
+                if agent.agent_type == "worker":
+                    logger.info(f"🔄 Worker {agent.name} completed task, looking for next task...")
+                    # Immediately check for new tasks to assign
+                    self._immediately_assign_next_task(agent)
                 
-                if task_completed:
-                    # If no files were created but this is a worker agent, try to create basic files
-                    if not files_created and agent.agent_type == "worker":
-                        logger.info(f"🔄 No files created by {agent.name}, creating basic files...")
-                        files_created = self._create_basic_files_for_agent(agent, task)
-                    
-                    self.task_queue.complete_task(task.id, response, files_created)
-                    agent.status = AgentStatus.IDLE  # Reset to idle so it can pick up new tasks
-                    agent.current_task_id = None
-                    agent.performance_metrics['tasks_completed'] += 1
-                    
-                    # Handle manager tasks (task creation)
-                    if agent.agent_type == "manager":
-                        logger.info(f"👨‍💼 Manager {agent.name} completed task, handling response...")
-                        loop.run_until_complete(self._handle_manager_response(agent, response))
-                    
-                    # Notify completion
-                    loop.run_until_complete(
-                        self._send_message(agent.id, None, f"Task completed: {task.description[:50]}...", "task_completion")
-                    )
-                    
-                    logger.info(f"🎉 Task completed for {agent.name}")
-                    
-                    # Immediately try to assign new task to this worker
-                    if agent.agent_type == "worker":
-                        logger.info(f"🔄 Worker {agent.name} completed task, looking for next task...")
-                        # Immediately check for new tasks to assign
-                        self._immediately_assign_next_task(agent)
-                    
-                else:
-                    # Task is still in progress - don't create retry task yet
-                    logger.info(f"⏳ Task still in progress for {agent.name}, continuing...")
-                    
-                    # Only create new tasks from manager responses
-                    if agent.agent_type == "manager":
-                        loop.run_until_complete(self._create_tasks_from_response(agent, response))
-                    
-            finally:
-                loop.close()
+            else:
+                # Task is still in progress - don't create retry task yet
+                logger.info(f"⏳ Task still in progress for {agent.name}, continuing...")
+                
+                # Only create new tasks from manager responses
+                if agent.agent_type == "manager":
+                    self.run_coroutine(self._create_tasks_from_response(agent, response))
                 
         except Exception as e:
             logger.error(f"❌ Error processing task for {agent.name}: {e}")
@@ -904,9 +1303,21 @@ IMPORTANT: After providing the task assignments in JSON format, end your respons
             agent.status = AgentStatus.IDLE  # Reset to idle so it can pick up new tasks
             agent.current_task_id = None
 
+    async def _finish_task(self, agent: Agent, task: Task, response: str):
+        """Follow-up coordination for a completed task, run together on the event loop"""
+        # Handle manager tasks (task creation)
+        if agent.agent_type == "manager":
+            logger.info(f"👨‍💼 Manager {agent.name} completed task, handling response...")
+            await self._handle_manager_response(agent, response)
+        
+        # Notify completion
+        await self._send_message(agent.id, None, f"Task completed: {task.description[:50]}...", "task_completion")
+
     def _build_task_context(self, agent: Agent, task: Task) -> str:
-        """Build context for task execution"""
-        context = f"""CURRENT TASK: {task.description}
+        """Build context for task execution; listings are sorted so equal state renders identically"""
+        parts = [f"""You are {agent.name}.
+
+CURRENT TASK: {task.description}
 
 PROJECT CONTEXT:
 - Project: {self.current_project}
@@ -917,32 +1328,37 @@ SYSTEM STATUS:
 - Completed Tasks: {len(self.task_queue.completed_tasks)}
 - Your Role: {agent.role}
 - Your Specialty: {agent.specialty}
-"""
+"""]
         
         # Add available agents for manager tasks
         if agent.agent_type == "manager":
-            context += "\nAVAILABLE TEAM MEMBERS:\n"
-            for a in memory_store.agents.values():
-                if a.agent_type == "worker":
-                    context += f"- {a.name} ({a.role}) - {a.specialty}\n"
-            context += "\nUse the exact agent names when creating tasks.\n"
-            context += "All workers are full-stack developers and can handle any type of task.\n"
+            parts.append("\nAVAILABLE TEAM MEMBERS:\n")
+            workers = sorted((a for a in memory_store.agents.values() if a.agent_type == "worker"), key=lambda a: a.name)
+            parts.extend(f"- {a.name} ({a.role}) - {a.specialty}\n" for a in workers)
+            parts.append("\nUse the exact agent names when creating tasks.\n")
+            parts.append("All workers are full-stack developers and can handle any type of task.\n")
         
         # Add current project files if available
         current_project = next((p for p in memory_store.projects.values() if p.status == "running"), None)
         if current_project and current_project.files:
-            context += f"\nCURRENT PROJECT FILES:\n"
-            for filename in current_project.files.keys():
-                context += f"- {filename}\n"
+            parts.append(self._project_file_listing(current_project))
         
         # Add recent messages
-        recent_messages = memory_store.messages[-5:]
+        recent_messages = memory_store.recent_messages(5)
         if recent_messages:
-            context += "\nRECENT TEAM COMMUNICATIONS:\n"
-            for msg in recent_messages:
-                context += f"- {msg.get('content', '')[:100]}...\n"
+            parts.append("\nRECENT TEAM COMMUNICATIONS:\n")
+            parts.extend(f"- {msg.get('content', '')[:100]}...\n" for msg in recent_messages)
         
-        return context
+        return "".join(parts)
+
+    def _project_file_listing(self, project: Project) -> str:
+        """Sorted file listing for task context, re-rendered only when the project's files change"""
+        etag = project.files_etag
+        if self._file_listing_cache and self._file_listing_cache[0] == etag:
+            return self._file_listing_cache[1]
+        listing = "\nCURRENT PROJECT FILES:\n" + "".join(f"- {filename}\n" for filename in sorted(project.files))
+        self._file_listing_cache = (etag, listing)
+        return listing
 
     def _extract_files_from_response(self, response: str) -> List[str]:
         """Extract and save files from AI response to current project"""
@@ -959,26 +1375,8 @@ SYSTEM STATUS:
         logger.info(f"🔍 Extracting files from response ({len(cleaned_response)} chars)")
         logger.debug(f"📝 Response preview: {cleaned_response[:500]}...")
         
-        # Enhanced patterns to catch more file formats
-        patterns = [
-            # Pattern 1: ```language filename: path/to/file.ext
-            r'```(?:[\w+]+)?\s*filename:\s*([^\n]+)\n(.*?)```',
-            # Pattern 2: ```path/to/file.ext (language)
-            r'```([^\n]+\.(?:py|js|jsx|ts|tsx|css|html|json|yml|yaml|md|txt|sh|dockerfile|sql|xml|env|gitignore|dockerignore|nvmrc|package\.json|requirements\.txt|README\.md))\n(.*?)```',
-            # Pattern 3: filename: path/to/file.ext\n```language\n
-            r'filename:\s*([^\n]+\.(?:py|js|jsx|ts|tsx|css|html|json|yml|yaml|md|txt|sh|dockerfile|sql|xml|env|gitignore|dockerignore|nvmrc|package\.json|requirements\.txt|README\.md))\n```(?:[\w+]+)?\n(.*?)```',
-            # Pattern 4: File: path/to/file.ext\n```language\n
-            r'File:\s*([^\n]+\.(?:py|js|jsx|ts|tsx|css|html|json|yml|yaml|md|txt|sh|dockerfile|sql|xml|env|gitignore|dockerignore|nvmrc|package\.json|requirements\.txt|README\.md))\n```(?:[\w+]+)?\n(.*?)```',
-            # Pattern 5: Create file: path/to/file.ext\n```language\n
-            r'Create file:\s*([^\n]+\.(?:py|js|jsx|ts|tsx|css|html|json|yml|yaml|md|txt|sh|dockerfile|sql|xml|env|gitignore|dockerignore|nvmrc|package\.json|requirements\.txt|README\.md))\n```(?:[\w+]+)?\n(.*?)```',
-            # Pattern 6: Simple code blocks with common extensions
-            r'```([^\n]+\.(?:py|js|jsx|ts|tsx|css|html|json|yml|yaml|md|txt|sh|dockerfile|sql|xml|env|gitignore|dockerignore|nvmrc|package\.json|requirements\.txt|README\.md))\n(.*?)```',
-            # Pattern 7: Any code block that might contain a file (fallback)
-            r'```(?:[\w+]+)?\n(.*?)```'
-        ]
-        
-        for pattern_idx, pattern in enumerate(patterns):
-            matches = re.findall(pattern, response, re.DOTALL)
+        for pattern_idx, pattern in enumerate(FILE_BLOCK_RES):
+            matches = pattern.findall(response)
             logger.debug(f"📋 Pattern {pattern_idx + 1} found {len(matches)} matches")
             
             for match in matches:
@@ -1014,7 +1412,7 @@ SYSTEM STATUS:
                         continue
                     
                     # Store file in project
-                    current_project.files[filename] = code
+                    current_project.set_file(filename, code)
                     files_created.append(filename)
                     memory_store.system_metrics['files_created'] += 1
                     
@@ -1023,14 +1421,7 @@ SYSTEM STATUS:
                     
                     # Also save to temp directory for backup
                     if current_project.temp_dir:
-                        try:
-                            file_path = Path(current_project.temp_dir) / filename
-                            file_path.parent.mkdir(parents=True, exist_ok=True)
-                            with open(file_path, 'w', encoding='utf-8') as f:
-                                f.write(code)
-                            logger.debug(f"💾 Saved to temp: {file_path}")
-                        except Exception as e:
-                            logger.error(f"❌ Error saving file {filename} to temp: {e}")
+                        self._file_writer.submit(self._write_file, self._resolved_root(current_project.temp_dir), filename, code)
                     
                     logger.info(f"📁 Created file: {filename} ({len(code)} chars)")
         
@@ -1137,7 +1528,7 @@ SYSTEM STATUS:
 
     def _create_file(self, project: Project, filename: str, content: str) -> str:
         """Create a file in the project"""
-        project.files[filename] = content
+        project.set_file(filename, content)
         memory_store.system_metrics['files_created'] += 1
         logger.info(f"📁 Created basic file: {filename} ({len(content)} chars)")
         
@@ -1147,24 +1538,33 @@ SYSTEM STATUS:
         return filename
 
     def _save_file_to_filesystem(self, project: Project, filename: str, content: str):
-        """Save file to the actual file system"""
+        """Queue a copy of the file for the project directory on disk"""
+        self._file_writer.submit(self._write_file, self._resolved_root(os.path.join("projects", project.id)), filename, content)
+
+    def _resolved_root(self, directory: str) -> Path:
+        """Absolute, symlink-free form of a project directory, resolved once"""
+        root = self._resolved_roots.get(directory)
+        if root is None:
+            root = self._resolved_roots[directory] = Path(directory).resolve()
+        return root
+
+    def _write_file(self, root: Path, filename: str, content: str):
+        """Write file under root, creating parent directories (runs on the writer thread)"""
         try:
-            # Create project directory if it doesn't exist
-            project_dir = f"projects/{project.id}"
-            os.makedirs(project_dir, exist_ok=True)
-            
-            # Create subdirectories if needed
-            file_path = os.path.join(project_dir, filename)
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            
-            # Write file to filesystem
+            # Filenames come from model output; refuse anything that resolves outside the root
+            file_path = (root / filename).resolve()
+            if os.path.commonpath([root, file_path]) != str(root):
+                logger.warning(f"⚠️ Refusing to write outside the project directory: {filename}")
+                return
+            # Only the single writer thread touches _created_dirs, so no lock is needed
+            if file_path.parent not in self._created_dirs:
+                file_path.parent.mkdir(parents=True, exist_ok=True)
+                self._created_dirs.add(file_path.parent)
             with open(file_path, 'w', encoding='utf-8') as f:
                 f.write(content)
-            
             logger.info(f"💾 Saved to filesystem: {file_path}")
-            
         except Exception as e:
-            logger.error(f"❌ Error saving file to filesystem: {e}")
+            logger.error(f"❌ Error saving file {filename} under {root} to filesystem: {e}")
 
     def _get_basic_react_app(self) -> str:
         return '''import React from 'react';
@@ -1354,27 +1754,18 @@ docker-compose up --build
 
     def _are_dependencies_satisfied(self, task_id: str) -> bool:
         """Check if all dependencies for a task are satisfied"""
-        task = memory_store.tasks.get(task_id)
-        if not task:
+        if task_id not in memory_store.tasks:
             return False
-        
-        for dep_id in task.dependencies:
-            if dep_id not in self.task_queue.completed_tasks:
-                return False
-        return True
+        return self.task_queue.unmet_dependencies.get(task_id) == 0
 
     def _assign_tasks_to_idle_workers(self):
         """Assign tasks to idle workers - this is the main worker-driven assignment"""
         # Get idle workers
-        idle_workers = [
-            agent for agent in memory_store.agents.values() 
-            if agent.agent_type == "worker" and agent.is_active and agent.status == AgentStatus.IDLE
-        ]
+        idle_workers = [agent for agent in memory_store.agents_with_status(AgentStatus.IDLE, "worker") if agent.is_active]
         
         # Get idle manager
         idle_manager = next(
-            (agent for agent in memory_store.agents.values() 
-             if agent.agent_type == "manager" and agent.is_active and agent.status == AgentStatus.IDLE), 
+            (agent for agent in memory_store.agents_with_status(AgentStatus.IDLE, "manager") if agent.is_active),
             None
         )
         
@@ -1476,10 +1867,7 @@ docker-compose up --build
     def _auto_assign_unassigned_tasks(self):
         """Auto-assign unassigned tasks to available workers"""
         # Get all available worker agents
-        available_workers = [
-            agent for agent in memory_store.agents.values() 
-            if agent.agent_type == "worker" and agent.is_active and agent.status == AgentStatus.IDLE
-        ]
+        available_workers = [agent for agent in memory_store.agents_with_status(AgentStatus.IDLE, "worker") if agent.is_active]
         
         if not available_workers:
             logger.debug("⏸️ No available workers for auto-assignment")
@@ -1512,15 +1900,11 @@ docker-compose up --build
     def _scavenge_unassigned_tasks(self):
         """Aggressively find and assign any unassigned tasks to idle workers"""
         # Get idle workers
-        idle_workers = [
-            agent for agent in memory_store.agents.values() 
-            if agent.agent_type == "worker" and agent.is_active and agent.status == AgentStatus.IDLE
-        ]
+        idle_workers = [agent for agent in memory_store.agents_with_status(AgentStatus.IDLE, "worker") if agent.is_active]
         
         # Get idle manager
         idle_manager = next(
-            (agent for agent in memory_store.agents.values() 
-             if agent.agent_type == "manager" and agent.is_active and agent.status == AgentStatus.IDLE), 
+            (agent for agent in memory_store.agents_with_status(AgentStatus.IDLE, "manager") if agent.is_active),
             None
         )
         
@@ -1708,10 +2092,7 @@ Consider if the work is complete or if more tasks are required.""",
     def _force_assign_to_idle_workers(self):
         """Force assign any remaining tasks to idle workers - this is the final fallback"""
         # Get idle workers
-        idle_workers = [
-            agent for agent in memory_store.agents.values() 
-            if agent.agent_type == "worker" and agent.is_active and agent.status == AgentStatus.IDLE
-        ]
+        idle_workers = [agent for agent in memory_store.agents_with_status(AgentStatus.IDLE, "worker") if agent.is_active]
         
         if not idle_workers:
             return
@@ -1797,10 +2178,7 @@ Consider if the work is complete or if more tasks are required.""",
     def _auto_assign_task_by_description(self, description: str) -> Optional[Agent]:
         """Auto-assign task to agent based on description keywords"""
         # Get available workers
-        available_workers = [
-            agent for agent in memory_store.agents.values() 
-            if agent.agent_type == "worker" and agent.is_active and agent.status == AgentStatus.IDLE
-        ]
+        available_workers = [agent for agent in memory_store.agents_with_status(AgentStatus.IDLE, "worker") if agent.is_active]
         
         if not available_workers:
             return None
@@ -1813,32 +2191,7 @@ Consider if the work is complete or if more tasks are required.""",
 
     def _is_task_complete(self, response: str) -> bool:
         """Check if task is completed"""
-        completion_indicators = [
-            "task completed",
-            "task finished", 
-            "implementation complete",
-            "work completed",
-            "finished successfully",
-            "planning complete",
-            "architecture complete",
-            "project plan complete",
-            "task breakdown complete",
-            "assignments complete",
-            "done",
-            "complete",
-            "finished",
-            "ready",
-            "implemented",
-            "created",
-            "built",
-            "developed",
-            "configured",
-            "set up",
-            "established"
-        ]
-        
-        response_lower = response.lower()
-        return any(indicator in response_lower for indicator in completion_indicators)
+        return COMPLETION_RE.search(response) is not None
 
     def _process_stuck_tasks(self):
         """Process tasks that might be stuck in in_progress state"""
@@ -1878,8 +2231,8 @@ Consider if the work is complete or if more tasks are required.""",
     def _check_for_stuck_agents(self):
         """Check for agents that have been working too long and reset them"""
         current_time = datetime.now()
-        for agent in memory_store.agents.values():
-            if agent.status == AgentStatus.WORKING and agent.current_task_id:
+        for agent in memory_store.agents_with_status(AgentStatus.WORKING):
+            if agent.current_task_id:
                 # Check if agent has been working for more than 10 minutes
                 elapsed = (current_time - agent.last_activity).total_seconds()
                 if elapsed > 600:  # 10 minutes
@@ -1902,27 +2255,16 @@ Consider if the work is complete or if more tasks are required.""",
         task_status = self.task_queue.get_status()
         total_tasks = task_status['pending'] + task_status['in_progress'] + task_status['completed'] + task_status['failed']
         
-        # Check if any workers are still working
-        working_workers = [
-            agent for agent in memory_store.agents.values()
-            if agent.agent_type == "worker" and agent.status == AgentStatus.WORKING
-        ]
-        
-        # Check if manager is working
-        manager_working = any(
-            agent.status == AgentStatus.WORKING 
-            for agent in memory_store.agents.values() 
-            if agent.agent_type == "manager"
-        )
+        # Only proceed if we have tasks and no pending/in-progress tasks AND no agent is working;
+        # agent status is only looked up once the queue has drained
+        all_done = (total_tasks > 0 and
+                    task_status['pending'] == 0 and
+                    task_status['in_progress'] == 0 and
+                    not memory_store.agents_with_status(AgentStatus.WORKING))
         
-        logger.info(f"🔍 Project completion check - Tasks: {task_status}, Working workers: {len(working_workers)}, Manager working: {manager_working}")
+        logger.info(f"🔍 Project completion check - Tasks: {task_status}, All done: {all_done}")
         
-        # Only proceed if we have tasks and no pending/in-progress tasks AND no workers are working
-        if (total_tasks > 0 and 
-            task_status['pending'] == 0 and 
-            task_status['in_progress'] == 0 and 
-            len(working_workers) == 0 and
-            not manager_working):
+        if all_done:
             
             logger.info(f"🎯 All tasks completed and no workers are working! Status: {task_status}")
             
@@ -2052,19 +2394,19 @@ End your review with "PROJECT COMPLETED" when satisfied.""",
         
         # Remove extra whitespace and normalize line endings
         cleaned = response.strip()
-        cleaned = re.sub(r'\r\n', '\n', cleaned)  # Normalize line endings
-        cleaned = re.sub(r'\n\s*\n', '\n', cleaned)  # Remove extra blank lines
-        cleaned = re.sub(r'[ \t]+', ' ', cleaned)  # Normalize spaces
+        cleaned = cleaned.replace('\r\n', '\n')  # Normalize line endings
+        cleaned = BLANK_LINES_RE.sub('\n', cleaned)  # Remove extra blank lines
+        cleaned = INLINE_SPACE_RE.sub(' ', cleaned)  # Normalize spaces
         
         # Clean up common formatting issues
-        cleaned = re.sub(r'```\s*json\s*', '```json\n', cleaned)  # Fix JSON code blocks
-        cleaned = re.sub(r'```\s*\n', '```\n', cleaned)  # Fix code block endings
-        cleaned = re.sub(r'\n\s*```', '\n```', cleaned)  # Fix code block starts
+        cleaned = JSON_FENCE_RE.sub('```json\n', cleaned)  # Fix JSON code blocks
+        cleaned = FENCE_END_RE.sub('```\n', cleaned)  # Fix code block endings
+        cleaned = FENCE_START_RE.sub('\n```', cleaned)  # Fix code block starts
         
         # Handle common JSON formatting issues
-        cleaned = re.sub(r',\s*}', '}', cleaned)  # Remove trailing commas
-        cleaned = re.sub(r',\s*]', ']', cleaned)  # Remove trailing commas in arrays
-        cleaned = re.sub(r'(["\w])\s*:\s*(["\w])', r'\1": "\2', cleaned)  # Fix missing quotes
+        cleaned = TRAILING_COMMA_OBJ_RE.sub('}', cleaned)  # Remove trailing commas
+        cleaned = TRAILING_COMMA_ARR_RE.sub(']', cleaned)  # Remove trailing commas in arrays
+        cleaned = LOOSE_PAIR_RE.sub(r'\1": "\2', cleaned)  # Fix missing quotes
         
         return cleaned
 
@@ -2075,15 +2417,8 @@ End your review with "PROJECT COMPLETED" when satisfied.""",
             cleaned_response = self._clean_and_validate_response(response)
             
             # Try multiple JSON extraction patterns
-            json_patterns = [
-                r'```json\s*\n(.*?)\n```',
-                r'```\s*\n(.*?)\n```',  # Fallback for any code block
-                r'\{.*?"tasks".*?\}',  # Simple JSON with tasks
-                r'\{[^{}]*"tasks"[^{}]*\}',  # More flexible JSON pattern
-            ]
-            
-            for pattern_idx, pattern in enumerate(json_patterns):
-                json_match = re.search(pattern, cleaned_response, re.DOTALL)
+            for pattern_idx, pattern in enumerate(MANAGER_JSON_RES):
+                json_match = pattern.search(cleaned_response)
                 if json_match:
                     json_str = json_match.group(1) if len(json_match.groups()) > 0 else json_match.group(0)
                     
@@ -2120,20 +2455,20 @@ End your review with "PROJECT COMPLETED" when satisfied.""",
         """Fix common JSON formatting issues"""
         try:
             # Fix missing quotes around property names
-            json_str = re.sub(r'(\w+):', r'"\1":', json_str)
+            json_str = UNQUOTED_KEY_RE.sub(r'"\1":', json_str)
             
             # Fix missing quotes around string values
-            json_str = re.sub(r':\s*([a-zA-Z][a-zA-Z0-9_]*)\s*([,}])', r': "\1"\2', json_str)
+            json_str = UNQUOTED_VALUE_RE.sub(r': "\1"\2', json_str)
             
             # Fix trailing commas
-            json_str = re.sub(r',\s*}', '}', json_str)
-            json_str = re.sub(r',\s*]', ']', json_str)
+            json_str = TRAILING_COMMA_OBJ_RE.sub('}', json_str)
+            json_str = TRAILING_COMMA_ARR_RE.sub(']', json_str)
             
             # Fix missing commas
-            json_str = re.sub(r'"\s*}\s*"', '",\n  "', json_str)
+            json_str = MISSING_COMMA_RE.sub('",\n  "', json_str)
             
             # Fix unescaped quotes in strings
-            json_str = re.sub(r'([^\\])"([^"]*?)([^\\])"', r'\1"\2\3"', json_str)
+            json_str = UNESCAPED_QUOTE_RE.sub(r'\1"\2\3"', json_str)
             
             return json_str
         except Exception as e:
@@ -2201,7 +2536,7 @@ End your review with "PROJECT COMPLETED" when satisfied.""",
         
         # Remove extra whitespace and normalize
         cleaned = agent_name.strip()
-        cleaned = re.sub(r'\s+', ' ', cleaned)  # Normalize spaces
+        cleaned = WHITESPACE_RE.sub(' ', cleaned)  # Normalize spaces
         
         # Handle common variations
         cleaned = cleaned.replace("developer", "Developer")
@@ -2225,8 +2560,8 @@ End your review with "PROJECT COMPLETED" when satisfied.""",
         
         # Remove extra whitespace and normalize
         cleaned = description.strip()
-        cleaned = re.sub(r'\s+', ' ', cleaned)  # Normalize spaces
-        cleaned = re.sub(r'\n\s*\n', '\n', cleaned)  # Remove extra blank lines
+        cleaned = WHITESPACE_RE.sub(' ', cleaned)  # Normalize spaces
+        cleaned = BLANK_LINES_RE.sub('\n', cleaned)  # Remove extra blank lines
         
         # Ensure minimum length
         if len(cleaned) < 10:
@@ -2271,10 +2606,10 @@ End your review with "PROJECT COMPLETED" when satisfied.""",
         
         # Remove extra whitespace and normalize
         cleaned = filename.strip()
-        cleaned = re.sub(r'\s+', '', cleaned)  # Remove all spaces
+        cleaned = WHITESPACE_RE.sub('', cleaned)  # Remove all spaces
         
         # Remove invalid characters
-        cleaned = re.sub(r'[<>:"/\\|?*]', '_', cleaned)
+        cleaned = INVALID_FILENAME_CHARS_RE.sub('_', cleaned)
         
         # Ensure it has a valid extension
         if '.' not in cleaned:
@@ -2295,14 +2630,13 @@ End your review with "PROJECT COMPLETED" when satisfied.""",
         
         # Remove null bytes and other problematic characters
         cleaned = content.replace('\x00', '')
-        cleaned = re.sub(r'[\x01-\x08\x0B\x0C\x0E-\x1F\x7F]', '', cleaned)
+        cleaned = CONTROL_CHARS_RE.sub('', cleaned)
         
         # Normalize line endings
-        cleaned = re.sub(r'\r\n', '\n', cleaned)
-        cleaned = re.sub(r'\r', '\n', cleaned)
+        cleaned = cleaned.replace('\r\n', '\n').replace('\r', '\n')
         
         # Remove trailing whitespace
-        cleaned = re.sub(r'[ \t]+$', '', cleaned, flags=re.MULTILINE)
+        cleaned = TRAILING_SPACE_RE.sub('', cleaned)
         
         # Ensure minimum content
         if len(cleaned.strip()) < 1:
@@ -2359,48 +2693,46 @@ End your review with "PROJECT COMPLETED" when satisfied.""",
                     
                     logger.debug(f"🔍 Looking for agent: '{agent_name}' or role: '{agent_role}'")
                     
-                    for agent in memory_store.agents.values():
-                        # Try multiple matching strategies
+                    # Exact name match through the name index; fall back to role and alias matching
+                    target_agent = memory_store.agent_named(agent_name)
+                    if target_agent:
+                        logger.info(f"✅ Found target agent by name: {target_agent.name}")
+                    else:
                         agent_name_lower = agent_name.lower().strip()
                         agent_role_lower = agent_role.lower().strip()
-                        agent_actual_name_lower = agent.name.lower().strip()
-                        agent_actual_role_lower = agent.role.lower().strip()
-                        
-                        # Direct name match
-                        if agent_actual_name_lower == agent_name_lower:
-                            target_agent = agent
-                            logger.info(f"✅ Found target agent by name: {agent.name}")
-                            break
-                        
-                        # Role match
-                        elif agent_actual_role_lower == agent_role_lower:
-                            target_agent = agent
-                            logger.info(f"✅ Found target agent by role: {agent.name} ({agent.role})")
-                            break
-                        
-                        # Partial role matching
-                        elif (agent_actual_role_lower in agent_name_lower or 
-                              agent_name_lower in agent_actual_role_lower):
-                            target_agent = agent
-                            logger.info(f"✅ Found target agent by partial role match: {agent.name} ({agent.role})")
-                            break
-                        
-                        # Handle common variations for generalist workers
-                        elif (agent_name_lower in ["developer1", "dev1", "worker1"] and 
-                              agent_actual_role_lower == "full stack developer"):
-                            target_agent = agent
-                            logger.info(f"✅ Found developer 1: {agent.name}")
-                            break
-                        elif (agent_name_lower in ["developer2", "dev2", "worker2"] and 
-                              agent_actual_role_lower == "full stack developer"):
-                            target_agent = agent
-                            logger.info(f"✅ Found developer 2: {agent.name}")
-                            break
-                        elif (agent_name_lower in ["developer3", "dev3", "worker3"] and 
-                              agent_actual_role_lower == "full stack developer"):
-                            target_agent = agent
-                            logger.info(f"✅ Found developer 3: {agent.name}")
-                            break
+                        for agent in memory_store.agents.values():
+                            # Try multiple matching strategies
+                            agent_actual_role_lower = agent.role.lower().strip()
+                            
+                            # Role match
+                            if agent_actual_role_lower == agent_role_lower:
+                                target_agent = agent
+                                logger.info(f"✅ Found target agent by role: {agent.name} ({agent.role})")
+                                break
+                            
+                            # Partial role matching
+                            elif (agent_actual_role_lower in agent_name_lower or 
+                                  agent_name_lower in agent_actual_role_lower):
+                                target_agent = agent
+                                logger.info(f"✅ Found target agent by partial role match: {agent.name} ({agent.role})")
+                                break
+                            
+                            # Handle common variations for generalist workers
+                            elif (agent_name_lower in ["developer1", "dev1", "worker1"] and 
+                                  agent_actual_role_lower == "full stack developer"):
+                                target_agent = agent
+                                logger.info(f"✅ Found developer 1: {agent.name}")
+                                break
+                            elif (agent_name_lower in ["developer2", "dev2", "worker2"] and 
+                                  agent_actual_role_lower == "full stack developer"):
+                                target_agent = agent
+                                logger.info(f"✅ Found developer 2: {agent.name}")
+                                break
+                            elif (agent_name_lower in ["developer3", "dev3", "worker3"] and 
+                                  agent_actual_role_lower == "full stack developer"):
+                                target_agent = agent
+                                logger.info(f"✅ Found developer 3: {agent.name}")
+                                break
                     
                     if target_agent:
                         # Create worker task
@@ -2533,48 +2865,109 @@ End your review with "TASK COMPLETED" if the work is satisfactory.""",
             'timestamp': datetime.now().isoformat()
         }
         
-        memory_store.messages.append(message)
+        memory_store.messages.append(message)  # bounded deque drops the oldest
         memory_store.system_metrics['messages_sent'] += 1
         
-        # Keep only last 100 messages
-        if len(memory_store.messages) > 100:
-            memory_store.messages = memory_store.messages[-100:]
-        
         # Emit message
-        socketio.emit('message_sent', message)
-
-    def _emit_status_update(self):
-        """Emit status updates to frontend"""
+        if self.dashboard_clients:
+            socketio.emit('message_sent', message, to=DASHBOARD_ROOM)
+
+    def _emit_status_update(self, sid: Optional[str] = None):
+        """Emit a delta to the dashboard room, or a full snapshot to one client when sid is given"""
+        full = sid is not None
+        if not full:
+            if not self.dashboard_clients:
+                return  # nobody is watching; clients resync with request_status on connect
+            now = time.monotonic()
+            self._status_emit_pending = now - self._last_status_emit < STATUS_EMIT_INTERVAL
+            if self._status_emit_pending:
+                return
+            self._last_status_emit = now
         try:
-            # Prepare agent data
-            agents_data = {aid: agent.to_dict() for aid, agent in memory_store.agents.items()}
+            if full:
+                # Snapshot for a single client; delta bookkeeping for the room is left untouched
+                agents_data = {aid: agent.to_dict() for aid, agent in memory_store.agents.items()}
+                removed_agents = []
+                messages = memory_store.recent_messages(10)
+            else:
+                # Agents whose cached dict was rebuilt since the last emit; an unchanged
+                # agent hands back the very same dict object, so identity is enough
+                agents_data = {}
+                for aid, agent in list(memory_store.agents.items()):
+                    agent_data = agent.to_dict()
+                    if self._emitted_agents.get(aid) is not agent_data:
+                        agents_data[aid] = agent_data
+                removed_agents = [aid for aid in self._emitted_agents if aid not in memory_store.agents]
+                
+                # Messages appended since the last emit (at most the last 10), cut from a snapshot
+                messages = memory_store.recent_messages(10)
+                for i in range(len(messages) - 1, -1, -1):
+                    if messages[i]['id'] == self._last_emitted_message_id:
+                        messages = messages[i + 1:]
+                        break
             
             # Prepare task queue status
             task_status = self.task_queue.get_status()
             
             # Calculate metrics
             uptime = time.time() - memory_store.system_metrics['start_time']
+            counters = {
+                'tasks_processed': memory_store.system_metrics['tasks_processed'],
+                'messages_sent': memory_store.system_metrics['messages_sent'],
+                'files_created': memory_store.system_metrics['files_created'],
+                'api_calls': memory_store.system_metrics['api_calls'],
+                'errors': memory_store.system_metrics['errors']
+            }
+            
+            # Nothing changed: skip the delta. Uptime alone doesn't count; the dashboard
+            # refreshes it from its /api/metrics poll
+            summary = (tuple(task_status.values()), self.system_running, self.current_project,
+                       tuple(counters.values()))
+            if not full and not (agents_data or removed_agents or messages) and summary == self._emitted_summary:
+                return
             
             # Emit update
             socketio.emit('system_update', {
+                'delta': not full,
                 'agents': agents_data,
-                'messages': memory_store.messages[-10:],  # Last 10 messages
+                'removed_agents': removed_agents,
+                'messages': messages,
                 'task_queue': task_status,
                 'system_running': self.system_running,
                 'current_project': self.current_project,
-                'metrics': {
-                    'uptime': int(uptime),
-                    'tasks_processed': memory_store.system_metrics['tasks_processed'],
-                    'messages_sent': memory_store.system_metrics['messages_sent'],
-                    'files_created': memory_store.system_metrics['files_created'],
-                    'api_calls': memory_store.system_metrics['api_calls'],
-                    'errors': memory_store.system_metrics['errors']
-                }
-            })
+                'metrics': {'uptime': int(uptime), **counters}
+            }, to=sid or DASHBOARD_ROOM)
+            
+            # Delta bookkeeping only advances once the delta is actually out
+            if not full:
+                self._emitted_agents.update(agents_data)
+                for aid in removed_agents:
+                    del self._emitted_agents[aid]
+                if messages:
+                    self._last_emitted_message_id = messages[-1]['id']
+                self._emitted_summary = summary
             
         except Exception as e:
             logger.error(f"Error emitting status update: {e}")
 
+    def get_agents_json(self) -> bytes:
+        """Serialized /api/agents payload, rebuilt only when agent or queue state changed"""
+        task_status = self.task_queue.get_status()
+        cache_key = (memory_store.agents_revision, self.system_running,
+                     self.current_project, tuple(task_status.values()))
+        if self._agents_json_cache and self._agents_json_cache[0] == cache_key:
+            return self._agents_json_cache[1]
+        
+        body = orjson.dumps({
+            'success': True,
+            'agents': memory_store.agents,
+            'system_running': self.system_running,
+            'current_project': self.current_project,
+            'task_queue': task_status
+        }, default=_orjson_default, option=orjson.OPT_PASSTHROUGH_DATACLASS)
+        self._agents_json_cache = (cache_key, body)
+        return body
+
     def stop_project(self):
         """Stop the current project"""
         self.system_running = False
@@ -2614,72 +3007,86 @@ End your review with "TASK COMPLETED" if the work is satisfactory.""",
         logger.info(f"📁 Project status: {current_project.status}")
         logger.info(f"📁 Project files count: {len(current_project.files)}")
         
-        for filename, content in current_project.files.items():
+        modified = current_project.created_at.timestamp()
+        for filename, (size, lines) in current_project.file_stats.items():
             files.append({
                 "path": filename,
-                "size": len(content.encode('utf-8')),
-                "modified": current_project.created_at.timestamp(),
-                "lines": len(content.split('\n'))
+                "size": size,
+                "modified": modified,
+                "lines": lines
             })
-            logger.debug(f"📁 File: {filename} ({len(content)} chars)")
+            logger.debug(f"📁 File: {filename} ({size} bytes)")
         
         logger.info(f"📁 Project has {len(files)} files: {[f['path'] for f in files]}")
         return {"files": files}
 
-    def create_project_zip(self) -> Optional[io.BytesIO]:
-        """Create ZIP file of current project from memory"""
-        current_project = next((p for p in memory_store.projects.values() if p.status in ["running", "reviewed"]), None)
-        if not current_project or not current_project.files:
-            logger.warning("⚠️ No running/reviewed project or no files to create ZIP")
-            logger.info(f"📁 Available projects: {[f'{p.id}: {p.status} ({len(p.files)} files)' for p in memory_store.projects.values()]}")
-            return None
-        
-        logger.info(f"📦 Creating ZIP for project {current_project.id} with {len(current_project.files)} files")
-        zip_buffer = io.BytesIO()
-        
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            for filename, content in current_project.files.items():
+    def cached_project_zip(self, project: Project) -> Optional[bytes]:
+        """Previously built ZIP for the project's current files, if one is cached"""
+        if self._zip_cache and self._zip_cache[0] == project.files_etag:
+            logger.info(f"📦 Reusing cached ZIP for project {project.id}")
+            return self._zip_cache[1]
+        return None
+
+    def stream_project_zip(self, project: Project):
+        """Yield a ZIP of the project's files chunk by chunk, one file at a time"""
+        files = list(project.files.items())  # snapshot; agents may keep writing while we stream
+        files_etag = project.files_etag
+        logger.info(f"📦 Streaming ZIP for project {project.id} with {len(files)} files")
+        
+        sink = _ZipChunkSink()
+        kept, kept_bytes = [], 0  # small archives are kept for the ZIP cache
+        with zipfile.ZipFile(sink, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+            for filename, content in files:
                 zip_file.writestr(filename, content)
                 logger.debug(f"📁 Added to ZIP: {filename} ({len(content)} chars)")
-        
-        zip_buffer.seek(0)
-        logger.info(f"✅ Created ZIP with {len(current_project.files)} files")
-        return zip_buffer
-
-    def _process_in_progress_tasks(self):
-        """Process any in-progress tasks that are assigned to working agents"""
+                chunk = sink.drain()
+                if kept is not None:
+                    kept.append(chunk)
+                    kept_bytes += len(chunk)
+                    if kept_bytes > ZIP_CACHE_MAX_BYTES:
+                        kept = None
+                yield chunk
+        chunk = sink.drain()  # central directory, written on close
+        yield chunk
+        
+        if kept is not None and kept_bytes + len(chunk) <= ZIP_CACHE_MAX_BYTES:
+            kept.append(chunk)
+            self._zip_cache = (files_etag, b''.join(kept))
+        logger.info(f"✅ Streamed ZIP with {len(files)} files")
+
+    def _in_progress_assignments(self) -> List[tuple]:
+        """(agent, task) pairs for in-progress tasks whose agent is still working on them"""
+        assignments = []
         for task_id in list(self.task_queue.in_progress_tasks):
             task = memory_store.tasks.get(task_id)
             if task and task.agent_id:
                 agent = memory_store.agents.get(task.agent_id)
                 if agent and agent.status == AgentStatus.WORKING and agent.current_task_id == task_id:
-                    # Agent is working on this task, process it
-                    logger.info(f"🎯 Processing in-progress task for {agent.name}: {task.description[:50]}...")
-                    
-                    # Create a thread to process this task
-                    thread = threading.Thread(
-                        target=self._process_task_sync,
-                        args=(agent, task)
-                    )
-                    thread.start()
-                    thread.join()  # Wait for this task to complete
-                    
-                    logger.info(f"✅ Completed processing in-progress task for {agent.name}")
+                    assignments.append((agent, task))
+        return assignments
+
+    def _process_in_progress_tasks(self):
+        """Process any in-progress tasks that are assigned to working agents"""
+        assignments = self._in_progress_assignments()
+        for agent, task in assignments:
+            logger.info(f"🎯 Processing in-progress task for {agent.name}: {task.description[:50]}...")
+        
+        # Independent agents call the API concurrently; wait for all of them
+        self._dispatch_tasks(assignments)
+        
+        for agent, task in assignments:
+            logger.info(f"✅ Completed processing in-progress task for {agent.name}")
 
     def _force_process_in_progress_tasks(self):
         """Force process any in-progress tasks that are assigned to working agents"""
-        for task_id in list(self.task_queue.in_progress_tasks):
-            task = memory_store.tasks.get(task_id)
-            if task and task.agent_id:
-                agent = memory_store.agents.get(task.agent_id)
-                if agent and agent.status == AgentStatus.WORKING and agent.current_task_id == task_id:
-                    # Agent is working on this task, process it immediately
-                    logger.info(f"🎯 Force processing in-progress task for {agent.name}: {task.description[:50]}...")
-                    
-                    # Process the task directly (not in a thread to avoid conflicts)
-                    self._process_task_sync(agent, task)
-                    
-                    logger.info(f"✅ Completed force processing in-progress task for {agent.name}")
+        assignments = self._in_progress_assignments()
+        for agent, task in assignments:
+            logger.info(f"🎯 Force processing in-progress task for {agent.name}: {task.description[:50]}...")
+        
+        self._dispatch_tasks(assignments)
+        
+        for agent, task in assignments:
+            logger.info(f"✅ Completed force processing in-progress task for {agent.name}")
 
 # Initialize system
 system = EnhancedMultiAgentSystem()
@@ -2692,13 +3099,7 @@ def index():
 @app.route('/api/agents', methods=['GET'])
 def get_agents():
     try:
-        return jsonify({
-            'success': True,
-            'agents': {aid: agent.to_dict() for aid, agent in memory_store.agents.items()},
-            'system_running': system.system_running,
-            'current_project': system.current_project,
-            'task_queue': system.task_queue.get_status()
-        })
+        return Response(system.get_agents_json(), mimetype='application/json')
     except Exception as e:
         logger.error(f"Error getting agents: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -2716,9 +3117,7 @@ def start_project():
             return jsonify({'success': False, 'error': 'Project description must be at least 10 characters'}), 400
         
         # Start project asynchronously
-        success = executor.submit(
-            lambda: asyncio.run(system.start_project(description))
-        ).result(timeout=30)
+        success = system.run_coroutine(system.start_project(description), timeout=30)
         
         if success:
             return jsonify({
@@ -2745,18 +3144,45 @@ def stop_project():
 @app.route('/api/project/files', methods=['GET'])
 def get_project_files():
     try:
+        current_project = next((p for p in memory_store.projects.values() if p.status in ["running", "reviewed"]), None)
+        etag = current_project.files_etag if current_project else None
+        if etag and _etag_matches(etag):
+            return _not_modified(etag)
+
         files_data = system.get_project_files()
-        return jsonify({'success': True, **files_data})
+        response = jsonify({'success': True, **files_data})
+        if etag:
+            response.set_etag(etag, weak=True)
+        return response
     except Exception as e:
         logger.error(f"Error getting project files: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+def _etag_matches(tag: str) -> bool:
+    """Check If-None-Match, ignoring the encoding suffix Flask-Compress appends"""
+    return any(candidate.split(':', 1)[0] == tag
+               for candidate in request.if_none_match.as_set(include_weak=True))
+
+def _not_modified(tag: str) -> Response:
+    response = Response(status=304)
+    response.set_etag(tag, weak=True)
+    return response
+
 @app.route('/api/project/status', methods=['GET'])
 def get_project_status():
     try:
         current_project = next((p for p in memory_store.projects.values() if p.status in ["running", "reviewed"]), None)
         task_status = system.task_queue.get_status()
         
+        # Cheap fingerprint of everything the status payload is built from
+        etag = "-".join([
+            current_project.files_etag if current_project else "none",
+            current_project.status if current_project else "",
+            *(str(count) for count in task_status.values())
+        ])
+        if _etag_matches(etag):
+            return _not_modified(etag)
+        
         status_data = {
             'success': True,
             'project_status': current_project.status if current_project else None,
@@ -2765,7 +3191,9 @@ def get_project_status():
             'files_count': len(current_project.files) if current_project else 0
         }
         
-        return jsonify(status_data)
+        response = jsonify(status_data)
+        response.set_etag(etag, weak=True)
+        return response
     except Exception as e:
         logger.error(f"Error getting project status: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -2777,24 +3205,30 @@ def get_project_files_list():
         if not current_project:
             return jsonify({'success': True, 'files': []})
         
+        etag = current_project.files_etag
+        if _etag_matches(etag):
+            return _not_modified(etag)
+        
         files_list = []
-        for filename, content in current_project.files.items():
+        for filename, (size, lines) in current_project.file_stats.items():
             files_list.append({
                 'name': filename,
-                'size': len(content.encode('utf-8')),
-                'lines': len(content.split('\n')),
+                'size': size,
+                'lines': lines,
                 'type': _get_file_type(filename)
             })
         
         # Sort files by type and name
         files_list.sort(key=lambda x: (x['type'], x['name']))
         
-        return jsonify({
+        response = jsonify({
             'success': True,
             'files': files_list,
             'total_files': len(files_list),
             'total_size': sum(f['size'] for f in files_list)
         })
+        response.set_etag(etag, weak=True)
+        return response
     except Exception as e:
         logger.error(f"Error getting project files list: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -2829,26 +3263,35 @@ def _get_file_type(filename):
 @app.route('/api/project/download', methods=['GET'])
 def download_project():
     try:
-        logger.info("📦 Creating project ZIP for download...")
-        zip_buffer = system.create_project_zip()
+        current_project = next((p for p in memory_store.projects.values() if p.status in ["running", "reviewed"]), None)
+        if not current_project or not current_project.files:
+            logger.warning("⚠️ No project files to download")
+            logger.info(f"📁 Available projects: {[f'{p.id}: {p.status} ({len(p.files)} files)' for p in memory_store.projects.values()]}")
+            return jsonify({'success': False, 'error': 'No project files to download'}), 404
         
-        if zip_buffer:
-            # Get current project info
-            current_project = next((p for p in memory_store.projects.values() if p.status in ["running", "reviewed"]), None)
-            if current_project:
-                logger.info(f"✅ Created ZIP with {len(current_project.files)} files: {list(current_project.files.keys())}")
-            else:
-                logger.warning("⚠️ No running project found")
-            
+        files_etag = current_project.files_etag
+        download_name = f'project_{datetime.now().strftime("%Y%m%d_%H%M%S")}.zip'
+        cached_zip = system.cached_project_zip(current_project)
+        if cached_zip is not None:
             return send_file(
-                zip_buffer,
+                io.BytesIO(cached_zip),
                 mimetype='application/zip',
                 as_attachment=True,
-                download_name=f'project_{datetime.now().strftime("%Y%m%d_%H%M%S")}.zip'
+                download_name=download_name,
+                conditional=True,
+                etag=files_etag
             )
-        else:
-            logger.warning("⚠️ No project files to download")
-            return jsonify({'success': False, 'error': 'No project files to download'}), 404
+        if _etag_matches(files_etag):
+            return _not_modified(files_etag)
+        
+        # Stream the archive as it is compressed instead of buffering it whole
+        response = Response(
+            stream_with_context(system.stream_project_zip(current_project)),
+            mimetype='application/zip',
+            headers={'Content-Disposition': f'attachment; filename={download_name}'}
+        )
+        response.set_etag(files_etag)
+        return response
     except Exception as e:
         logger.error(f"❌ Error downloading project: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -2864,12 +3307,13 @@ def get_file_content(filename):
             return jsonify({'success': False, 'error': 'File not found'}), 404
         
         content = current_project.files[filename]
+        size, lines = current_project.file_stats[filename]
         return jsonify({
             'success': True,
             'filename': filename,
             'content': content,
-            'size': len(content.encode('utf-8')),
-            'lines': len(content.split('\n')),
+            'size': size,
+            'lines': lines,
             'type': _get_file_type(filename)
         })
     except Exception as e:
@@ -2880,13 +3324,12 @@ def get_file_content(filename):
 def get_metrics():
     try:
         uptime = time.time() - memory_store.system_metrics['start_time']
-        active_agents = sum(1 for agent in memory_store.agents.values() if agent.is_active)
         
         return jsonify({
             'success': True,
             'metrics': {
                 'uptime': int(uptime),
-                'active_agents': active_agents,
+                'active_agents': memory_store.active_agent_count(),
                 'total_agents': len(memory_store.agents),
                 'tasks_processed': memory_store.system_metrics['tasks_processed'],
                 'messages_sent': memory_store.system_metrics['messages_sent'],
@@ -2916,15 +3359,18 @@ def reset_system():
 @socketio.on('connect')
 def handle_connect():
     logger.info('Client connected')
+    join_room(DASHBOARD_ROOM)
+    system.dashboard_clients.add(request.sid)
     emit('connected', {'status': 'success'})
 
 @socketio.on('disconnect')
 def handle_disconnect():
+    system.dashboard_clients.discard(request.sid)
     logger.info('Client disconnected')
 
 @socketio.on('request_status')
 def handle_status_request():
-    system._emit_status_update()
+    system._emit_status_update(sid=request.sid)
 
 # Error handlers
 @app.errorhandler(404)
@@ -2946,8 +3392,7 @@ if __name__ == '__main__':
         socketio.run(app, debug=False, host='0.0.0.0', port=5000, allow_unsafe_werkzeug=True)
     finally:
         # Cleanup
-        executor.shutdown(wait=False)
-        asyncio.run(system.anthropic_client.close())
+        system.shutdown()
         
         # Clean up temp directories
         for project in memory_store.projects.values():
@@ -6,11 +6,42 @@ No databases required - only Anthropic API
 
 import os
 import sys
+import select
 import subprocess
+import hashlib
+import shutil
+import importlib.machinery
+import importlib.util
 import urllib.request
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Virtual environment paths, resolved once for this platform
+VENV_DIR = Path("venv")
+VENV_BIN = VENV_DIR / ("Scripts" if sys.platform == "win32" else "bin")
+EXE_SUFFIX = ".exe" if sys.platform == "win32" else ""
+VENV_PIP = str(VENV_BIN / f"pip{EXE_SUFFIX}")
+VENV_PYTHON = str(VENV_BIN / f"python{EXE_SUFFIX}")
+if sys.platform == "win32":
+    VENV_SITE_PACKAGES = str(VENV_DIR / "Lib" / "site-packages")
+else:
+    VENV_SITE_PACKAGES = str(VENV_DIR / "lib" / f"python{sys.version_info.major}.{sys.version_info.minor}" / "site-packages")
+
+# Minimal requirements written when requirements.txt is missing; bytes so no newline translation
+REQUIREMENTS_CONTENT = b"""Flask==2.3.3
+Flask-SocketIO==5.3.6
+python-socketio==5.9.0
+python-engineio==4.7.1
+msgpack==1.0.7
+aiohttp==3.9.1
+orjson==3.9.10
+python-dotenv==1.0.0
+Flask-Compress==1.14
+gunicorn==21.2.0
+eventlet==0.33.3
+"""
+
 def print_banner():
     """Print setup banner"""
     print("\n" + "="*60)
@@ -31,68 +62,99 @@ def check_python_version():
 
 def check_pip():
     """Check if pip is available"""
-    try:
-        subprocess.run([sys.executable, "-m", "pip", "--version"], 
-                      capture_output=True, check=True)
+    if importlib.util.find_spec("pip") is not None:
         print("✅ pip is available")
-    except subprocess.CalledProcessError:
+    else:
         print("❌ pip is not available")
         print("   Please install pip first")
         sys.exit(1)
 
 def create_virtual_environment():
     """Create virtual environment"""
-    venv_path = Path("venv")
-    
-    if venv_path.exists():
+    # Check the interpreter, not just the directory, so a half-created venv is rebuilt
+    if Path(VENV_PYTHON).exists():
         print("📦 Virtual environment already exists")
         return
     
     print("📦 Creating virtual environment...")
     try:
-        subprocess.run([sys.executable, "-m", "venv", "venv"], check=True)
+        # uv installs into the venv from outside, so skip bootstrapping pip when it's available
+        venv_args = ["--without-pip"] if shutil.which("uv") else []
+        subprocess.run([sys.executable, "-m", "venv", *venv_args, "venv"], check=True, close_fds=False)
         print("✅ Virtual environment created")
     except subprocess.CalledProcessError:
         print("❌ Failed to create virtual environment")
         sys.exit(1)
 
-def get_pip_command():
-    """Get pip command for the virtual environment"""
-    if sys.platform == "win32":
-        return str(Path("venv") / "Scripts" / "pip")
-    else:
-        return str(Path("venv") / "bin" / "pip")
-
 def install_dependencies():
     """Install dependencies"""
     print("📦 Installing dependencies...")
     
     # Create minimal requirements.txt if it doesn't exist
-    requirements_content = """Flask==2.3.3
-Flask-SocketIO==5.3.6
-python-socketio==5.9.0
-python-engineio==4.7.1
-aiohttp==3.9.1
-python-dotenv==1.0.0
-gunicorn==21.2.0
-eventlet==0.33.3
-"""
-    
-    if not Path("requirements.txt").exists():
-        with open("requirements.txt", "w") as f:
-            f.write(requirements_content)
+    requirements_path = Path("requirements.txt")
+    if not requirements_path.exists():
+        requirements_path.write_bytes(REQUIREMENTS_CONTENT)
         print("✅ Created requirements.txt")
     
-    pip_cmd = get_pip_command()
+    # Skip pip entirely when requirements.txt hasn't changed since the last install
+    req_hash = hashlib.blake2b(requirements_path.read_bytes()).hexdigest()
+    hash_path = VENV_DIR / ".req-hash"
+    if hash_path.exists() and hash_path.read_text().strip() == req_hash and Path(VENV_PYTHON).exists():
+        print("✅ Dependencies up to date")
+        return
+    
+    # Prefer uv when it's on PATH: parallel downloads and a shared wheel cache
+    uv_cmd = shutil.which("uv")
+    if uv_cmd:
+        try:
+            env = {**os.environ, "UV_CACHE_DIR": str(Path.home() / ".cache" / "triniteam-uv")}
+            subprocess.run([uv_cmd, "pip", "install", "--python", VENV_PYTHON,
+                            "-r", "requirements.txt"],
+                          check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                          env=env, close_fds=False)
+            hash_path.write_text(req_hash)
+            print("✅ Dependencies installed (uv)")
+            return
+        except subprocess.CalledProcessError:
+            print("⚠️  uv install failed, falling back to pip")
+    
+    # Persistent wheel cache so repeat setups skip the downloads
+    cache_dir = Path.home() / ".cache" / "triniteam-pip"
+    # No self-update probe, prompts or root warning in an unattended install
+    env = {**os.environ, "PIP_DISABLE_PIP_VERSION_CHECK": "1", "PIP_NO_INPUT": "1",
+           "PIP_ROOT_USER_ACTION": "ignore"}
     try:
-        subprocess.run([pip_cmd, "install", "-r", "requirements.txt"], 
-                      check=True, capture_output=True)
+        # Bootstrap pip only now, if the venv was created without it
+        if not Path(VENV_PIP).exists():
+            subprocess.run([VENV_PYTHON, "-m", "ensurepip", "--default-pip"],
+                          check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, close_fds=False)
+        # Bytecode is compiled lazily on first import, only for modules actually used
+        subprocess.run([VENV_PIP, "install", "--prefer-binary", "--cache-dir", str(cache_dir),
+                        "--no-compile", "--progress-bar=off", "-r", "requirements.txt"],
+                      check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                      env=env, close_fds=False)
+        hash_path.write_text(req_hash)
         print("✅ Dependencies installed")
     except subprocess.CalledProcessError as e:
         print("❌ Failed to install dependencies")
         print(f"   Error: {e}")
+        if e.stderr:
+            print(e.stderr.decode(errors="replace").strip())
         sys.exit(1)
 
+def prompt_with_timeout(prompt, timeout=30):
+    """Read a line from the terminal, giving up after timeout seconds"""
+    if sys.platform == "win32":
+        # select() only works on sockets on Windows
+        return input(prompt).strip()
+    
+    print(prompt, end="", flush=True)
+    ready, _, _ = select.select([sys.stdin], [], [], timeout)
+    if not ready:
+        print()
+        return ""
+    return sys.stdin.readline().strip()
+
 def create_env_file():
     """Create .env file"""
     env_path = Path(".env")
@@ -103,8 +165,10 @@ def create_env_file():
     
     print("🔧 Creating .env file...")
     
-    # Get API key from user
-    api_key = input("Enter your Anthropic API key (or press Enter to skip): ").strip()
+    # Take the API key from the environment; only prompt when someone is at the terminal
+    api_key = os.environ.get("ANTHROPIC_API_KEY", "").strip()
+    if not api_key and sys.stdin.isatty():
+        api_key = prompt_with_timeout("Enter your Anthropic API key (or press Enter to skip): ")
     
     env_content = f"""# Multi-Agent System Configuration
 ANTHROPIC_API_KEY={api_key}
@@ -139,24 +203,16 @@ def test_installation():
     print("🧪 Testing installation...")
     
     try:
-        # Test imports
-        test_script = """
-import flask
-import flask_socketio
-import aiohttp
-import dotenv
-print("✅ All imports successful")
-"""
-        
-        python_cmd = str(Path("venv") / ("Scripts" if sys.platform == "win32" else "bin") / "python")
-        result = subprocess.run([python_cmd, "-c", test_script], 
-                              capture_output=True, text=True)
+        # Look the packages up in the venv's site-packages without starting its interpreter
+        site_packages = [VENV_SITE_PACKAGES]
+        missing = [name for name in ("flask", "flask_socketio", "aiohttp", "dotenv")
+                   if importlib.machinery.PathFinder.find_spec(name, site_packages) is None]
         
-        if result.returncode == 0:
+        if not missing:
             print("✅ Installation test passed")
         else:
             print("❌ Installation test failed")
-            print(f"   Error: {result.stderr}")
+            print(f"   Missing packages: {', '.join(missing)}")
     
     except Exception as e:
         print(f"❌ Installation test failed: {e}")
@@ -207,9 +263,13 @@ def main():
     
     # Setup environment
     create_virtual_environment()
-    install_dependencies()
+    # The API key prompt runs first so install output can't interleave with it
     create_env_file()
-    create_directories()
+    # pip runs in the background while the remaining local setup happens
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        install = executor.submit(install_dependencies)
+        create_directories()
+        install.result()
     
     # Test installation
     test_installation()
@@ -50,6 +50,8 @@ class EnhancedMultiAgentApp {
             this.retryCount = 0;
             this.updateConnectionStatus(true);
             this.showNotification("Connected to server", "success");
+            // Full snapshot once; later system_update events are deltas
+            this.socket.emit("request_status");
         });
 
         this.socket.on("disconnect", () => {
@@ -282,8 +284,20 @@ class EnhancedMultiAgentApp {
     }
 
     handleSystemUpdate(data) {
-        this.state.agents = data.agents;
-        this.state.messages = data.messages;
+        if (data.delta) {
+            // Only changed agents and new messages are sent between full snapshots
+            Object.assign(this.state.agents, data.agents);
+            (data.removed_agents || []).forEach((id) => delete this.state.agents[id]);
+            (data.messages || []).forEach((message) => {
+                if (!this.state.messages.some((m) => m.id === message.id)) {
+                    this.state.messages.unshift(message);
+                }
+            });
+            this.state.messages = this.state.messages.slice(0, 100);
+        } else {
+            this.state.agents = data.agents;
+            this.state.messages = data.messages;
+        }
         this.state.taskQueue = data.task_queue;
         this.state.systemRunning = data.system_running;
         this.state.currentProject = data.current_project;
@@ -12,7 +12,7 @@ const STATIC_FILES = [
     "/static/js/app.js",
     "/static/manifest.json",
     "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css",
-    "https://cdnjs.cloudflare.com/ajax/libs/socket.io/4.0.1/socket.io.js",
+    "https://cdnjs.cloudflare.com/ajax/libs/socket.io/4.0.1/socket.io.msgpack.min.js",
     "https://cdnjs.cloudflare.com/ajax/libs/highlight.js/11.8.0/highlight.min.js",
     "https://cdnjs.cloudflare.com/ajax/libs/Chart.js/3.9.1/chart.min.js",
 ];
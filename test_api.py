@@ -6,14 +6,34 @@ Simple test script to verify API calls are working
 import os
 import asyncio
 import aiohttp
-from dotenv import load_dotenv
+import orjson
+from typing import Optional
+from dotenv import dotenv_values
 
-# Load environment variables
-load_dotenv()
+# Shared pooled session so repeated calls reuse the TCP/TLS connection
+_session: Optional[aiohttp.ClientSession] = None
+
+async def _get_session() -> aiohttp.ClientSession:
+    """Create the shared session on first use"""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=10, ttl_dns_cache=300, keepalive_timeout=75),
+            timeout=aiohttp.ClientTimeout(total=30)
+        )
+    return _session
+
+async def close_session():
+    """Close the shared session"""
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
 
 async def test_api_call():
     """Test the Anthropic API call"""
-    api_key = os.getenv("ANTHROPIC_API_KEY")
+    # Environment wins, as with load_dotenv(); .env is only parsed when the variable isn't set
+    api_key = os.getenv("ANTHROPIC_API_KEY") or dotenv_values().get("ANTHROPIC_API_KEY")
     if not api_key:
         print("❌ ANTHROPIC_API_KEY not found in environment variables")
         return False
@@ -41,25 +61,33 @@ async def test_api_call():
     }
     
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=headers, json=payload) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    response_text = result['content'][0]['text']
-                    print(f"✅ API call successful!")
-                    print(f"📝 Response: {response_text}")
-                    return True
-                else:
-                    error_text = await response.text()
-                    print(f"❌ API call failed: {response.status} - {error_text}")
-                    return False
+        session = await _get_session()
+        async with session.post(url, headers=headers, data=orjson.dumps(payload)) as response:
+            if response.status == 200:
+                result = orjson.loads(await response.read())
+                response_text = result['content'][0]['text']
+                print(f"✅ API call successful!")
+                print(f"📝 Response: {response_text}")
+                return True
+            else:
+                # The first 512 bytes are enough for a diagnostic line
+                error_text = (await response.content.read(512)).decode("utf-8", "replace")
+                print(f"❌ API call failed: {response.status} - {error_text}")
+                return False
     except Exception as e:
         print(f"❌ Error making API call: {e}")
         return False
 
+async def main():
+    """Run the API test and close the shared session"""
+    try:
+        return await test_api_call()
+    finally:
+        await close_session()
+
 if __name__ == "__main__":
     print("🧪 Testing Anthropic API connection...")
-    success = asyncio.run(test_api_call())
+    success = asyncio.run(main())
     if success:
         print("🎉 API test passed! The system should be able to make API calls.")
     else: